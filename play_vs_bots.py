@@ -202,44 +202,6 @@ class BotClient(GridClient):
     def handle_game_state_update(self, data):
         super().handle_game_state_update(data)
     
-    def bfs_find_nearest_unclaimed(self):
-        start_x, start_y = self.pos_x, self.pos_y
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
-        queue = deque([(start_x, start_y)])
-        visited = set([(start_x, start_y)])
-        parent_map = {{}}
-        found_target = None
-        
-        while queue:
-            curr_x, curr_y = queue.popleft()
-            idx = curr_y * GRID_WIDTH + curr_x
-            if self.grid_state[idx] == UNCLAIMED_ID:
-                found_target = (curr_x, curr_y)
-                break
-            
-            for dx, dy in directions:
-                nx, ny = curr_x + dx, curr_y + dy
-                if not (0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT):
-                    continue
-                if (nx, ny) in visited:
-                    continue
-                n_idx = ny * GRID_WIDTH + nx
-                owner = self.grid_state[n_idx]
-                if owner == UNCLAIMED_ID or owner == self.client_id:
-                    visited.add((nx, ny))
-                    parent_map[(nx, ny)] = (curr_x, curr_y, (dx, dy))
-                    queue.append((nx, ny))
-        
-        if found_target:
-            path = deque()
-            curr = found_target
-            while curr != (start_x, start_y):
-                prev_x, prev_y, move = parent_map[curr]
-                path.appendleft(move)
-                curr = (prev_x, prev_y)
-            return path
-        return None
-    
     def run_automated(self):
         self.send_hello()
         self.socket.setblocking(False)
@@ -264,7 +226,7 @@ class BotClient(GridClient):
                             pkt, payload = unpack_packet(data)
                             if pkt.msg_type == MessageType.SERVER_INIT_RESPONSE:
                                 self.handle_server_hello(data)
-                            elif pkt.msg_type == MessageType.SNAPSHOT:
+                            elif pkt.msg_type == MessageType.SNAPSHOT or pkt.msg_type == MessageType.DELTA_SNAPSHOT:
                                 self.handle_game_state_update(data)
                             elif pkt.msg_type == MessageType.GAME_OVER:
                                 self.handle_game_over(data)
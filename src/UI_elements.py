@@ -9,6 +9,26 @@ class Button:
         self.text = text
         self.font = font
         self.hovered = False
+        # Idle/hover appearances are rendered once and just blitted on each draw
+        self._surfaces = {
+            False: self._render(BUTTON_COLOR),
+            True: self._render(BUTTON_HOVER_COLOR),
+        }
+
+    def _render(self, color):
+        """Pre-render the button (background, border, label) in the given color."""
+        surface = pygame.Surface(self.rect.size)
+        area = surface.get_rect()
+
+        # Draw button background
+        surface.fill(color)
+        pygame.draw.rect(surface, WHITE, area, 2)  # Border
+
+        # Draw text
+        text_surface = self.font.render(self.text, True, WHITE)
+        text_rect = text_surface.get_rect(center=area.center)
+        surface.blit(text_surface, text_rect)
+        return surface
 
     def is_hovered(self, mouse_pos):
         """Check if mouse is over button."""
@@ -22,14 +42,4 @@ class Button:
     def draw(self, surface, mouse_pos):
         """Draw the button."""
         self.is_hovered(mouse_pos)
-        color = BUTTON_HOVER_COLOR if self.hovered else BUTTON_COLOR
-
-        # Draw button background
-        pygame.draw.rect(surface, color, self.rect)
-        pygame.draw.rect(surface, WHITE, self.rect, 2)  # Border
-
-        # Draw text
-        text_surface = self.font.render(self.text, True, WHITE)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
-
+        surface.blit(self._surfaces[self.hovered], self.rect)
@@ -1,10 +1,12 @@
 """Client for GridClash game."""
 import argparse
+import logging
 import os
 import socket
 import struct
 import sys
 import time
+import numpy as np
 import pygame
 from collections import deque
 import threading
@@ -19,13 +21,25 @@ if PROJECT_ROOT not in sys.path:
 
 
 
-from src.protocol import unpack_packet, get_current_timestamp_ms, pack_packet, MessageType, UNCLAIMED_ID
+from src.protocol import unpack_packet, get_current_timestamp_ms, pack_packet, MessageType, UNCLAIMED_ID, \
+    DELTA_HEAD, DELTA_CELL
 from src.server import MAX_PACKET_SIZE
 from src.constants import SCREEN_WIDTH, PLAYER_STRIP_HEIGHT, SCREEN_HEIGHT, CELL_SIZE, WHITE, BLACK, GRAY, LIGHT_GRAY, \
-    DARK_GRAY, GRID_COLOR, BUTTON_COLOR, BUTTON_HOVER_COLOR, STRIP_BG_COLOR, PLAYER_COLORS, CONNECTION_TIMEOUT, \
+    DARK_GRAY, GRID_COLOR, BUTTON_COLOR, BUTTON_HOVER_COLOR, STRIP_BG_COLOR, PLAYER_COLORS, PLAYER_COLORS_ARR, CONNECTION_TIMEOUT, \
     MAX_CLIENTS, GRID_WIDTH, GRID_HEIGHT
 from src.UI_elements import Button
 
+# Hot-path diagnostics (per snapshot / per move) go through this logger so they cost
+# nothing unless DEBUG is enabled; lifecycle messages below still use print.
+log = logging.getLogger("gridclash.client")
+
+# Per-player snapshot record: ID, score, x, y, dx, dy (19 bytes)
+_PLAYER_RECORD = struct.Struct('!BHiiii')
+
+# In-flight ACQUIRE_REQUESTs live in a ring indexed by seq & PENDING_MASK. Outstanding
+# requests are bounded by RTT x move rate (single digits), far below the ring size.
+PENDING_RING_SIZE = 32
+PENDING_MASK = PENDING_RING_SIZE - 1
 
 
 class GridClient:
@@ -43,14 +57,18 @@ class GridClient:
         self.heartbeat_interval = 1.0
         self.packet_count = 0
         self.latencies = deque(maxlen=1000)  # Limit memory usage
+        self._lat_sum = 0  # Running sum of self.latencies, kept in step with the deque
 
         # Connection tracking
         self.last_packet_time = time.time()
         self.connected = True
         self.server_full = False
         # State Management (Phase 2)
-        self.target_players = {}  # {player_id: (target_x, target_y)} -> Authoritative from server
-        self.visual_players = {}  # {player_id: (curr_x, curr_y)} -> Smoothed for rendering
+        # Player positions as parallel (MAX_CLIENTS, 2) arrays, one row per slot
+        self._tgt_xy = np.zeros((MAX_CLIENTS, 2), dtype=np.float32)  # Authoritative from server
+        self._vis_xy = np.zeros((MAX_CLIENTS, 2), dtype=np.float32)  # Smoothed for rendering
+        self._id_to_slot = {}  # {player_id: row in _tgt_xy/_vis_xy}
+        self._free_slots = list(range(MAX_CLIENTS))
 
         # Snapshot/sequence tracking to detect stale/duplicate packets
         self.last_snapshot_id = -1
@@ -59,6 +77,9 @@ class GridClient:
         self.pos_y = 0
         # Grid state (Phase 3)
         self.grid_state = bytearray([UNCLAIMED_ID] * (GRID_WIDTH * GRID_HEIGHT))
+        # Grid of the last full SNAPSHOT (keyframe); DELTA_SNAPSHOTs are applied on top of it
+        self._keyframe_grid = bytes(self.grid_state)
+        self._keyframe_id = -1
         self.player_scores = {}  # {player_id: score}
         self.game_over = False
         self.winner_info = None  # (winner_id, winner_score)
@@ -70,21 +91,39 @@ class GridClient:
         self.big_font = None
         self.new_game_button = None
 
+        # Dirty-rect rendering: regions of the screen that changed since the last frame
+        self._dirty_rects = []
+        self._full_redraw = True
+        self._drawn_pos = None
+        self._drawn_scores = None
+        self._overlay_drawn = False
+
         # Reliability variables
         self.seq_num = 0
-        self.pending_requests = {}  # Stores requests waiting for ACKs
+        self._pending = [None] * PENDING_RING_SIZE  # Requests waiting for ACKs, slot = seq & PENDING_MASK
         self.rtt = 100.0            # Estimated Round Trip Time (ms)
         self.rtt_dev = 0.0          # RTT Deviation
 
+        # msg_type -> handler(data) for packets received from the server
+        self._dispatch = {
+            MessageType.SERVER_INIT_RESPONSE: self.handle_server_hello,
+            MessageType.SNAPSHOT: self.handle_game_state_update,
+            MessageType.DELTA_SNAPSHOT: self.handle_game_state_update,
+            MessageType.GAME_OVER: self.handle_game_over,
+            MessageType.SERVER_FULL: self.handle_server_full,
+            MessageType.ACK: self._handle_ack_nack_data,
+            MessageType.NACK: self._handle_ack_nack_data,  # ←  RELIABILITY
+        }
+
     def is_legal_move(self, row, col):
         """Check if move is legal."""
-        # Check if cell is unclaimed
-        index = row * GRID_WIDTH + col
-        # Bounds check
-        if not (0 <= row < GRID_HEIGHT and 0 <= col < GRID_WIDTH):
+        # Bounds check (bitwise | on bools: no short-circuit, same cost for every input)
+        if (row < 0) | (row >= GRID_HEIGHT) | (col < 0) | (col >= GRID_WIDTH):
             print(f"[CLIENT] Move to ({row}, {col}) is out of bounds")
             return False
 
+        # Check if cell is unclaimed
+        index = row * GRID_WIDTH + col
         if self.grid_state[index] != UNCLAIMED_ID and self.grid_state[index] != self.client_id:
             print(f"[CLIENT] Cell ({row}, {col}) is already claimed")
             return False
@@ -140,13 +179,13 @@ class GridClient:
             print(f"[ERROR] Invalid SERVER_HELLO: {e}")
 
     def handle_game_state_update(self, data):
-        """Process game state update (snapshots)."""
+        """Process game state update (full or delta snapshots)."""
         recv_ts_ms = get_current_timestamp_ms()
         try:
             packet, payload = unpack_packet(data)
 
             # Only process snapshots
-            if packet.msg_type != MessageType.SNAPSHOT:
+            if packet.msg_type != MessageType.SNAPSHOT and packet.msg_type != MessageType.DELTA_SNAPSHOT:
                 return
 
             # Stale/duplicate checks
@@ -162,7 +201,7 @@ class GridClient:
             # Bookkeeping
             self.packet_count += 1
             latency = recv_ts_ms - packet.server_timestamp
-            self.latencies.append(latency)
+            self.record_latency(latency)
 
             # Update connection time
             self.last_packet_time = time.time()
@@ -170,53 +209,88 @@ class GridClient:
 
             # Parse payload
             GRID_SIZE_BYTES = GRID_WIDTH * GRID_HEIGHT
-            if len(payload) < GRID_SIZE_BYTES + 1:
-                return  # Malformed payload
-
-            self.grid_state = bytearray(payload[:GRID_SIZE_BYTES])
-            num_players = payload[GRID_SIZE_BYTES]
-            offset = GRID_SIZE_BYTES + 1
-
-            BYTES_PER_PLAYER = 19 # ← UPDATED: B H i i i i (ID, score, x, y, dx, dy)
+            if packet.msg_type == MessageType.SNAPSHOT:
+                if len(payload) < GRID_SIZE_BYTES + 1:
+                    return  # Malformed payload
+                new_grid = bytearray(payload[:GRID_SIZE_BYTES])
+                self._keyframe_grid = bytes(new_grid)
+                self._keyframe_id = packet.snapshot_id
+                offset = GRID_SIZE_BYTES
+            else:
+                base_id, num_cells = DELTA_HEAD.unpack_from(payload, 0)
+                offset = DELTA_HEAD.size + num_cells * DELTA_CELL.size
+                if len(payload) < offset + 1:
+                    return  # Malformed payload
+                if base_id == self._keyframe_id:
+                    # Cells are cumulative since the keyframe, so rebuild from it rather than
+                    # patching grid_state (a lost delta would otherwise leave holes)
+                    new_grid = bytearray(self._keyframe_grid)
+                    for idx, owner in DELTA_CELL.iter_unpack(payload[DELTA_HEAD.size:offset]):
+                        new_grid[idx] = owner
+                else:
+                    new_grid = None  # Keyframe missed: keep the grid, still take the players
+
+            if new_grid is not None:
+                if new_grid != self.grid_state:
+                    # Only cells whose owner changed need to be pushed to the display
+                    changed = np.frombuffer(self.grid_state, np.uint8) != np.frombuffer(new_grid, np.uint8)
+                    for idx in np.flatnonzero(changed):
+                        row, col = divmod(int(idx), GRID_WIDTH)
+                        self._dirty_rects.append(self._cell_rect(row, col))
+                # new_grid is a fresh bytearray on both the keyframe and the delta path
+                self.grid_state = new_grid
+            num_players = payload[offset]
+            offset += 1
+
+            BYTES_PER_PLAYER = _PLAYER_RECORD.size  # ← UPDATED: B H i i i i (ID, score, x, y, dx, dy)
             # Track which players are in this update
             current_players = set()
 
-            for _ in range(num_players):
-                if offset + BYTES_PER_PLAYER <= len(payload):
-                    p_id, score, pos_x, pos_y, dx, dy = struct.unpack('!BHiiii', payload[offset:offset + BYTES_PER_PLAYER])
-
-                    # ← DELTA RECOVERY
-                    if self.last_seq_num != -1 and packet.seq_num == self.last_seq_num + 2:
-                        recovered_x = pos_x - dx
-                        recovered_y = pos_y - dy
-                        print(f"[REDUNDANCY] Recovered P{p_id} pos: ({recovered_x}, {recovered_y})")
-
-                    self.target_players[p_id] = (pos_x, pos_y)
-                    self.player_scores[p_id] = score
-                    current_players.add(p_id)
-
-                    if p_id not in self.visual_players:
-                        self.visual_players[p_id] = (float(pos_x), float(pos_y))
-
-                    offset += BYTES_PER_PLAYER
-                else:
-                    break
+            # Decode every complete player record in one C-level pass (a truncated tail is ignored)
+            num_records = min(num_players, (len(payload) - offset) // BYTES_PER_PLAYER)
+            records = memoryview(payload)[offset:offset + num_records * BYTES_PER_PLAYER]
+
+            for p_id, score, pos_x, pos_y, dx, dy in _PLAYER_RECORD.iter_unpack(records):
+                # ← DELTA RECOVERY
+                if self.last_seq_num != -1 and packet.seq_num == self.last_seq_num + 2:
+                    recovered_x = pos_x - dx
+                    recovered_y = pos_y - dy
+                    log.debug("[REDUNDANCY] Recovered P%d pos: (%d, %d)", p_id, recovered_x, recovered_y)
+
+                self.player_scores[p_id] = score
+                current_players.add(p_id)
+
+                slot = self._id_to_slot.get(p_id)
+                if slot is None and self._free_slots:
+                    # New player: snap the visual position to the target
+                    slot = self._free_slots.pop(0)
+                    self._id_to_slot[p_id] = slot
+                    self._vis_xy[slot] = (pos_x, pos_y)
+                if slot is not None:
+                    self._tgt_xy[slot] = (pos_x, pos_y)
 
             # Remove disconnected players
-            for p_id in list(self.visual_players.keys()):
-                if p_id not in current_players:
-                    del self.visual_players[p_id]
-                    if p_id in self.target_players:
-                        del self.target_players[p_id]
-                    if p_id in self.player_scores:
-                        del self.player_scores[p_id]
+            for p_id in self._id_to_slot.keys() - current_players:
+                self._free_slots.append(self._id_to_slot.pop(p_id))
+                self.player_scores.pop(p_id, None)
 
             # Periodic logging
             if self.packet_count % 60 == 0 and self.latencies:
-                avg = sum(self.latencies) / len(self.latencies)
-                print(f"[NET] Packets: {self.packet_count}, Avg Latency: {avg:.2f} ms")
+                avg = self.average_latency()
+                log.debug("[NET] Packets: %d, Avg Latency: %.2f ms", self.packet_count, avg)
         except Exception as e:
-            print(f"Error unpacking packet: {e}")
+            log.warning("Error unpacking packet: %s", e)
+
+    def record_latency(self, latency):
+        """Add a latency sample to the bounded window, keeping the running sum in O(1)."""
+        if len(self.latencies) == self.latencies.maxlen:
+            self._lat_sum -= self.latencies[0]  # about to be evicted by append
+        self.latencies.append(latency)
+        self._lat_sum += latency
+
+    def average_latency(self):
+        """Mean latency (ms) over the current window."""
+        return self._lat_sum / len(self.latencies)
 
     def handle_game_over(self, data):
         """Process GAME_OVER message."""
@@ -251,21 +325,33 @@ class GridClient:
         timer = threading.Timer(rto / 1000.0, self._retransmit_request, [self.seq_num])
         timer.start()
 
-        self.pending_requests[self.seq_num] = {
-            'row': row, 'col': col, 'ts': client_ts,
+        slot = self.seq_num & PENDING_MASK
+        stale = self._pending[slot]
+        if stale is not None:
+            # Request from a full ring-lap ago was never resolved; it is superseded now
+            stale['timer'].cancel()
+        self._pending[slot] = {
+            'seq': self.seq_num, 'row': row, 'col': col, 'ts': client_ts,
             'timer': timer, 'retries': 0, 'send_time': get_current_timestamp_ms()
         }
-        print(f"[CLIENT {self.client_id}] → ACQUIRE_REQUEST ({row},{col}) seq={self.seq_num} ts={client_ts}")
+        log.debug("[CLIENT %d] → ACQUIRE_REQUEST (%d,%d) seq=%d ts=%d", self.client_id, row, col, self.seq_num, client_ts)
 
     
+    def _get_pending(self, seq):
+        """Return the in-flight request for seq, or None if it was already resolved."""
+        req = self._pending[seq & PENDING_MASK]
+        if req is None or req['seq'] != seq:
+            return None
+        return req
+
     def _retransmit_request(self, seq):
-        """Retransmit ACQUIRE_REQUEST on timeout."""   
-        if seq not in self.pending_requests:
+        """Retransmit ACQUIRE_REQUEST on timeout."""
+        req = self._get_pending(seq)
+        if req is None:
             return
-        req = self.pending_requests[seq]
         if req['retries'] >= 3:
-            print(f"[CLIENT {self.client_id}] Acquire failed after 3 retries (seq={seq})")
-            del self.pending_requests[seq]
+            log.debug("[CLIENT %d] Acquire failed after 3 retries (seq=%d)", self.client_id, seq)
+            self._pending[seq & PENDING_MASK] = None
             return
 
         payload = struct.pack('!BBQ', req['row'], req['col'], req['ts'])
@@ -277,7 +363,7 @@ class GridClient:
         if rto > 2000: rto = 2000  # Max 2s
         req['timer'] = threading.Timer(rto / 1000.0, self._retransmit_request, [seq])
         req['timer'].start()
-        print(f"[CLIENT {self.client_id}] Retransmit seq={seq} retry={req['retries']}")
+        log.debug("[CLIENT %d] Retransmit seq=%d retry=%d", self.client_id, seq, req['retries'])
 
     def handle_ack_nack(self, pkt, payload):
         """Handle ACK/NACK from server."""
@@ -289,10 +375,10 @@ class GridClient:
         except struct.error:
             return
 
-        req = self.pending_requests.get(seq_num)
+        req = self._get_pending(seq_num)
         if req is None:
             # Already processed or unknown sequence — ignore.
-            print(f"[ACK/NACK] Received for unknown seq={seq_num}, ignoring")
+            log.debug("[ACK/NACK] Received for unknown seq=%d, ignoring", seq_num)
             return
 
         # Stop the timer for this request (safe if already fired)
@@ -309,19 +395,21 @@ class GridClient:
 
             # Commit the move (position) and remove pending request
             self.pos_x, self.pos_y = req['col'], req['row']
-            print(f"[ACK] Seq {seq_num} confirmed by server -> claimed ({req['row']},{req['col']})")
-            try:
-                del self.pending_requests[seq_num]
-            except KeyError:
-                pass
+            log.debug("[ACK] Seq %d confirmed by server -> claimed (%d,%d)", seq_num, req['row'], req['col'])
+            self._pending[seq_num & PENDING_MASK] = None
         else:
             # NACK: server rejected this request — retry immediately (reset retries)
-            print(f"[NACK] Seq {seq_num} rejected by server, retransmitting immediately")
+            log.debug("[NACK] Seq %d rejected by server, retransmitting immediately", seq_num)
             req['retries'] = 0
             # schedule immediate retransmit on a short delay to avoid blocking caller
             req['timer'] = threading.Timer(0.01, self._retransmit_request, [seq_num])
             req['timer'].start()
 
+    def _handle_ack_nack_data(self, data):
+        """Adapter so ACK/NACK fits the handler(data) dispatch signature."""
+        pkt, payload = unpack_packet(data)
+        self.handle_ack_nack(pkt, payload)
+
     def update_visuals(self, dt):
         """
         Interpolate visual positions towards target positions.
@@ -332,17 +420,13 @@ class GridClient:
         if lerp_factor > 1.0:
             lerp_factor = 1.0
 
-        for p_id, target_pos in self.target_players.items():
-            tx, ty = target_pos
-            if p_id not in self.visual_players:
-                self.visual_players[p_id] = (float(tx), float(ty))
-                continue
+        # LERP every slot at once (free slots are harmless: nothing reads them)
+        self._vis_xy += (self._tgt_xy - self._vis_xy) * lerp_factor
 
-            vx, vy = self.visual_players[p_id]
-            # LERP
-            new_vx = vx + (tx - vx) * lerp_factor
-            new_vy = vy + (ty - vy) * lerp_factor
-            self.visual_players[p_id] = (new_vx, new_vy)
+    @staticmethod
+    def _cell_rect(row, col):
+        """Screen rectangle covered by grid cell (row, col)."""
+        return pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
 
     def init_graphics(self):
         """Initialize Pygame graphics (Phase 3)."""
@@ -353,29 +437,44 @@ class GridClient:
         self.font = pygame.font.Font(None, 24)
         self.big_font = pygame.font.Font(None, 48)
 
+        # Overlay surfaces are reused every frame instead of being reallocated
+        self._fullscreen_dark = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA).convert_alpha()
+        self._fullscreen_dark.fill((0, 0, 0, 180))
+        self._cell_highlight = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA).convert_alpha()
+        self._cell_highlight.fill((255, 255, 255, 120))  # semi-transparent white overlay
+
+        # Owner id -> RGB lookup table, used to paint the whole grid in one NumPy gather
+        self._palette = np.empty((256, 3), dtype=np.uint8)
+        self._palette[:] = PLAYER_COLORS['default']
+        self._palette[:len(PLAYER_COLORS_ARR)] = PLAYER_COLORS_ARR
+        self._palette[UNCLAIMED_ID] = WHITE
+        # One pixel per cell, scaled up onto the grid area of the screen
+        self._grid_surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT))
+        self._grid_area = self.screen.subsurface((0, 0, SCREEN_WIDTH, SCREEN_WIDTH))
+
+        # New Game button never moves, so it is built once here
+        button_width = 200
+        button_height = 50
+        button_x = (SCREEN_WIDTH - button_width) // 2
+        button_y = SCREEN_HEIGHT // 2 + 20
+        self.new_game_button = Button(button_x, button_y, button_width, button_height,
+                                      "New Game", self.font)
+
     def draw_game(self):
         """Render the game state (Phase 3)."""
         if not self.screen:
             return
 
-        # 1. Background
-        self.screen.fill(WHITE)
-
-        # 2. Claimed Cells (render before grid lines)
-        for row in range(GRID_HEIGHT):
-            for col in range(GRID_WIDTH):
-                owner_id = self.grid_state[row * GRID_WIDTH + col]
-                if owner_id != UNCLAIMED_ID:
-                    color = PLAYER_COLORS.get(owner_id, PLAYER_COLORS['default'])
-                    rect = (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                    pygame.draw.rect(self.screen, color, rect)
+        # 1-2. Background + Claimed Cells (render before grid lines)
+        # The palette maps unclaimed cells to white, so this also clears the grid area;
+        # the player strip paints its own background.
+        grid2d = np.frombuffer(self.grid_state, dtype=np.uint8).reshape(GRID_HEIGHT, GRID_WIDTH)
+        pygame.surfarray.blit_array(self._grid_surface, self._palette[grid2d].swapaxes(0, 1))
+        pygame.transform.scale(self._grid_surface, (SCREEN_WIDTH, SCREEN_WIDTH), self._grid_area)
 
 
         # 2.5 Highlight current player position
-        highlight_color = (255, 255, 255, 120)  # semi-transparent white overlay
-        overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-        pygame.draw.rect(overlay, highlight_color, overlay.get_rect())
-        self.screen.blit(overlay, (self.pos_x * CELL_SIZE, self.pos_y * CELL_SIZE))
+        self.screen.blit(self._cell_highlight, (self.pos_x * CELL_SIZE, self.pos_y * CELL_SIZE))
         highlight_rect = (
             self.pos_x * CELL_SIZE,
             self.pos_y * CELL_SIZE,
@@ -392,7 +491,8 @@ class GridClient:
             pygame.draw.line(self.screen, GRID_COLOR, (0, y), (SCREEN_WIDTH, y))
 
         # # 4. Players (cursors)
-        # for p_id, (x, y) in self.visual_players.items():
+        # for p_id, slot in self._id_to_slot.items():
+        #     x, y = self._vis_xy[slot]
         #     color = PLAYER_COLORS.get(p_id, PLAYER_COLORS['default'])
         #     pygame.draw.circle(self.screen, color, (int(x), int(y)), 10)
         #     # Highlight self
@@ -418,8 +518,30 @@ class GridClient:
 
 
 
-        # 9. Display Flip
-        pygame.display.flip()
+        # 9. Display Update (dirty rects only, unless the whole screen changed)
+        overlay_active = self.server_full or not self.connected or (self.game_over and self.winner_info)
+        if overlay_active or self._overlay_drawn:
+            self._full_redraw = True
+        self._overlay_drawn = bool(overlay_active)
+
+        current_pos = (self.pos_x, self.pos_y)
+        if current_pos != self._drawn_pos:
+            if self._drawn_pos is not None:
+                self._dirty_rects.append(self._cell_rect(self._drawn_pos[1], self._drawn_pos[0]))
+            self._dirty_rects.append(self._cell_rect(self.pos_y, self.pos_x))
+            self._drawn_pos = current_pos
+
+        current_scores = (self.client_id, tuple(sorted(self.player_scores.items())))
+        if current_scores != self._drawn_scores:
+            self._dirty_rects.append(pygame.Rect(0, SCREEN_WIDTH, SCREEN_WIDTH, PLAYER_STRIP_HEIGHT))
+            self._drawn_scores = current_scores
+
+        if self._full_redraw:
+            pygame.display.flip()
+            self._full_redraw = False
+        elif self._dirty_rects:
+            pygame.display.update(self._dirty_rects)
+        self._dirty_rects.clear()
 
     def draw_player_strip(self):
         """Draw horizontal player strip below the grid."""
@@ -520,9 +642,7 @@ class GridClient:
         winner_id, winner_score = self.winner_info
 
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._fullscreen_dark, (0, 0))
 
         # Winner text
         if winner_id == self.client_id:
@@ -542,18 +662,10 @@ class GridClient:
         score_rect = score_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30))
         self.screen.blit(score_surface, score_rect)
 
-        # New Game Button
-        button_width = 200
-        button_height = 50
-        button_x = (SCREEN_WIDTH - button_width) // 2
-        button_y = SCREEN_HEIGHT // 2 + 20
-
-        if not self.new_game_button:
-            self.new_game_button = Button(button_x, button_y, button_width, button_height,
-                                         "New Game", self.font)
-
-        mouse_pos = pygame.mouse.get_pos()
-        self.new_game_button.draw(self.screen, mouse_pos)
+        # New Game Button (mouse is only polled while the game-over screen is up)
+        if self.game_over:
+            mouse_pos = pygame.mouse.get_pos()
+            self.new_game_button.draw(self.screen, mouse_pos)
 
     def reset_game_state(self):
         """Reset game state for new game."""
@@ -561,11 +673,12 @@ class GridClient:
         self.winner_info = None
         self.grid_state = bytearray([UNCLAIMED_ID] * (GRID_WIDTH * GRID_HEIGHT))
         self.player_scores.clear()
-        self.target_players.clear()
-        self.visual_players.clear()
-        self.new_game_button = None
+        self._id_to_slot.clear()
+        self._free_slots = list(range(MAX_CLIENTS))
         self.last_snapshot_id = -1
         self.last_seq_num = -1
+        self._keyframe_id = -1
+        self._full_redraw = True
         self.draw_game()
         print("[CLIENT] Game state reset")
 
@@ -577,7 +690,6 @@ class GridClient:
         print(f"[CLIENT {self.client_id}] Sent new game request")
         #self.reset_game_state()
         self.waiting_for_new_game = True
-        self.new_game_button = None
 
     def check_connection(self):
         """Check if connection to server is still alive."""
@@ -606,6 +718,9 @@ class GridClient:
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         running = False
+                    elif event.type == pygame.WINDOWEXPOSED:
+                        # Window contents were invalidated by the OS, repaint everything
+                        self._full_redraw = True
                     elif event.type == pygame.MOUSEBUTTONDOWN:
                         # Check for New Game button click first
                         if self.game_over and self.new_game_button:
@@ -644,16 +759,9 @@ class GridClient:
                         data, addr = self.socket.recvfrom(MAX_PACKET_SIZE)
                         if addr == self.server_address:
                             pkt, payload = unpack_packet(data)
-                            if pkt.msg_type == MessageType.SERVER_INIT_RESPONSE:
-                                self.handle_server_hello(data)
-                            elif pkt.msg_type == MessageType.SNAPSHOT:
-                                self.handle_game_state_update(data)
-                            elif pkt.msg_type == MessageType.GAME_OVER:
-                                self.handle_game_over(data)
-                            elif pkt.msg_type == MessageType.SERVER_FULL:
-                                self.handle_server_full(data)
-                            elif pkt.msg_type == MessageType.ACK or pkt.msg_type == MessageType.NACK:
-                                self.handle_ack_nack(pkt, payload)  # ← RELIABILITY    
+                            handler = self._dispatch.get(pkt.msg_type)
+                            if handler is not None:
+                                handler(data)
                 except BlockingIOError:
                     # No more data available right now
                     pass
@@ -671,7 +779,7 @@ class GridClient:
             print(f"[CLIENT {self.client_id}] Interrupted")
         finally:
             if self.latencies:
-                avg_latency = sum(self.latencies) / len(self.latencies)
+                avg_latency = self.average_latency()
                 print(f"FINAL STATS: Received {self.packet_count} packets. Average latency: {avg_latency:.4f} ms")
             try:
                 pygame.quit()
@@ -691,9 +799,7 @@ class GridClient:
             return
 
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._fullscreen_dark, (0, 0))
 
         # Server full text
         text = "SERVER IS FULL"
@@ -8,6 +8,8 @@ import time
 from collections import deque
 import threading
 
+import numpy as np
+
 # Headless mode detection - check before importing pygame
 _HEADLESS_MODE = os.environ.get('GRIDCLASH_HEADLESS', '').lower() in ('1', 'true', 'yes')
 
@@ -31,13 +33,29 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from src.protocol import unpack_packet, get_current_timestamp_ms, pack_packet, MessageType, UNCLAIMED_ID
+from src.protocol import unpack_packet, get_current_timestamp_ms, pack_packet, MessageType, UNCLAIMED_ID, \
+    DELTA_HEAD, DELTA_CELL
 from src.server import MAX_PACKET_SIZE
 from src.constants import SCREEN_WIDTH, PLAYER_STRIP_HEIGHT, SCREEN_HEIGHT, CELL_SIZE, WHITE, BLACK, GRAY, LIGHT_GRAY, \
     DARK_GRAY, GRID_COLOR, BUTTON_COLOR, BUTTON_HOVER_COLOR, STRIP_BG_COLOR, PLAYER_COLORS, CONNECTION_TIMEOUT, \
     MAX_CLIENTS, GRID_WIDTH, GRID_HEIGHT
 
 
+# Moves as (dx, dy): Up, Down, Left, Right. Grid coordinates are (row, col) = (y, x), and the
+# API expects request(row, col) => request(y, x).
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+# Bitboard masks for the BFS (bit y * GRID_WIDTH + x = cell (x, y)): a shift by one column must not
+# wrap into the neighbouring row, so x+1 results are cleared in column 0 and x-1 results in the last
+_NOT_FIRST_COL = sum(1 << (y * GRID_WIDTH + x) for y in range(GRID_HEIGHT) for x in range(1, GRID_WIDTH))
+_NOT_LAST_COL = sum(1 << (y * GRID_WIDTH + x) for y in range(GRID_HEIGHT) for x in range(GRID_WIDTH - 1))
+
+
+def _to_bits(mask):
+    """Pack a flat boolean cell mask into an int with bit i set where mask[i] is True."""
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
 class GridClient:
     """
     GridClient class for managing the client-side of the game.
@@ -65,10 +83,14 @@ class GridClient:
         # Snapshot/sequence tracking to detect stale/duplicate packets
         self.last_snapshot_id = -1
         self.last_seq_num = -1
+        self.last_pkt = None  # header of the last packet given to handle_game_state_update
         self.pos_x = 0
         self.pos_y = 0
         # Grid state (Phase 3)
         self.grid_state = bytearray([UNCLAIMED_ID] * (GRID_WIDTH * GRID_HEIGHT))
+        # Grid of the last full SNAPSHOT (keyframe); DELTA_SNAPSHOTs are applied on top of it
+        self._keyframe_grid = bytes(self.grid_state)
+        self._keyframe_id = -1
         self.player_scores = {}  # {player_id: score}
         self.game_over = False
         self.winner_info = None  # (winner_id, winner_score)
@@ -113,6 +135,67 @@ class GridClient:
 
         return True
 
+    def bfs_find_nearest_unclaimed(self):
+        """
+        Uses BFS to find the shortest path to an unclaimed cell.
+        Returns a deque of (dx, dy) moves relative to current position.
+        """
+        start_x, start_y = self.pos_x, self.pos_y
+        W, H = GRID_WIDTH, GRID_HEIGHT
+        not_first_col, not_last_col = _NOT_FIRST_COL, _NOT_LAST_COL
+
+        # The BFS runs as bit-parallel wavefronts: cell (x, y) is bit y * GRID_WIDTH + x of one
+        # Python int, so each step grows the whole frontier by one cell in all four directions
+        # with a few shifts instead of popping cells one at a time
+        grid = np.frombuffer(self.grid_state, dtype=np.uint8)
+        unclaimed = grid == UNCLAIMED_ID
+        targets = _to_bits(unclaimed)
+        # Passable if Untaken OR Owned by Me. We can only move through our own cells or unclaimed
+        # cells; the server (and client check) rejects moves into another player's cell, so
+        # OTHER PLAYERS' cells are obstacles.
+        passable = _to_bits(unclaimed | (grid == self.client_id))
+
+        frontier = visited = 1 << (start_y * W + start_x)
+        layers = [frontier]  # layers[d] = cells first reached after d moves
+        append = layers.append
+        while not frontier & targets:
+            frontier = (((frontier << W) | (frontier >> W)
+                         | ((frontier << 1) & not_first_col) | ((frontier >> 1) & not_last_col))
+                        & passable & ~visited)
+            if not frontier:
+                return None  # No reachable unclaimed cell
+            visited |= frontier
+            append(frontier)
+
+        # Reconstruct path: walk back from the nearest target (lowest bit), one layer per move.
+        # The four predecessor checks are unrolled in DIRECTIONS order (up, down, left, right),
+        # stepping the bit index i = y * W + x along with x and y
+        found = frontier & targets
+        i = (found & -found).bit_length() - 1
+        y, x = divmod(i, W)
+        path = deque()
+        appendleft = path.appendleft
+        for step in range(len(layers) - 2, -1, -1):
+            layer = layers[step]
+            if y + 1 < H and (layer >> (i + W)) & 1:
+                appendleft((0, -1))
+                y += 1
+                i += W
+            elif y > 0 and (layer >> (i - W)) & 1:
+                appendleft((0, 1))
+                y -= 1
+                i -= W
+            elif x + 1 < W and (layer >> (i + 1)) & 1:
+                appendleft((-1, 0))
+                x += 1
+                i += 1
+            else:
+                # Every cell of layer d + 1 has a neighbour in layer d, so this is the last option
+                appendleft((1, 0))
+                x -= 1
+                i -= 1
+        return path
+
     def send_hello(self):
         """Send hello message to server."""
         payload = struct.pack('!B', self.client_id)
@@ -151,13 +234,16 @@ class GridClient:
             print(f"[ERROR] Invalid SERVER_HELLO: {e}")
 
     def handle_game_state_update(self, data):
-        """Process game state update (snapshots)."""
+        """Process game state update (full or delta snapshots)."""
         recv_ts_ms = get_current_timestamp_ms()
+        self.last_pkt = None
         try:
             packet, payload = unpack_packet(data)
+            # Parsed header of the packet being handled, for subclasses (None if it did not parse)
+            self.last_pkt = packet
 
             # Only process snapshots
-            if packet.msg_type != MessageType.SNAPSHOT:
+            if packet.msg_type != MessageType.SNAPSHOT and packet.msg_type != MessageType.DELTA_SNAPSHOT:
                 return
 
             # Stale/duplicate checks
@@ -181,12 +267,26 @@ class GridClient:
 
             # Parse payload
             GRID_SIZE_BYTES = GRID_WIDTH * GRID_HEIGHT
-            if len(payload) < GRID_SIZE_BYTES + 1:
-                return  # Malformed payload
-
-            self.grid_state = bytearray(payload[:GRID_SIZE_BYTES])
-            num_players = payload[GRID_SIZE_BYTES]
-            offset = GRID_SIZE_BYTES + 1
+            if packet.msg_type == MessageType.SNAPSHOT:
+                if len(payload) < GRID_SIZE_BYTES + 1:
+                    return  # Malformed payload
+                self.grid_state = bytearray(payload[:GRID_SIZE_BYTES])
+                self._keyframe_grid = bytes(self.grid_state)
+                self._keyframe_id = packet.snapshot_id
+                offset = GRID_SIZE_BYTES
+            else:
+                base_id, num_cells = DELTA_HEAD.unpack_from(payload, 0)
+                offset = DELTA_HEAD.size + num_cells * DELTA_CELL.size
+                if len(payload) < offset + 1:
+                    return  # Malformed payload
+                # Cells are cumulative since the keyframe; without it, keep the grid until the next one
+                if base_id == self._keyframe_id:
+                    grid = bytearray(self._keyframe_grid)
+                    for idx, owner in DELTA_CELL.iter_unpack(payload[DELTA_HEAD.size:offset]):
+                        grid[idx] = owner
+                    self.grid_state = grid
+            num_players = payload[offset]
+            offset += 1
 
             BYTES_PER_PLAYER = 19  # ← UPDATED: B H i i i i (ID, score, x, y, dx, dy)
             # Track which players are in this update
@@ -574,6 +674,7 @@ class GridClient:
         self.new_game_button = None
         self.last_snapshot_id = -1
         self.last_seq_num = -1
+        self._keyframe_id = -1
         self.draw_game()
         print("[CLIENT] Game state reset")
 
@@ -661,7 +762,7 @@ class GridClient:
                             pkt, payload = unpack_packet(data)
                             if pkt.msg_type == MessageType.SERVER_INIT_RESPONSE:
                                 self.handle_server_hello(data)
-                            elif pkt.msg_type == MessageType.SNAPSHOT:
+                            elif pkt.msg_type == MessageType.SNAPSHOT or pkt.msg_type == MessageType.DELTA_SNAPSHOT:
                                 self.handle_game_state_update(data)
                             elif pkt.msg_type == MessageType.GAME_OVER:
                                 self.handle_game_over(data)
@@ -1,4 +1,6 @@
-import random
+from functools import lru_cache
+
+import numpy as np
 
 # --- Core Constraint ---
 MAX_CLIENTS = 4
@@ -8,6 +10,7 @@ MAX_CLIENTS = 4
 #############################################
 
 
+@lru_cache(maxsize=None)
 def calculate_grid_size(max_clients):
     """
     Sets the logical grid dimensions based on the number of players.
@@ -38,40 +41,36 @@ def generate_player_positions(max_clients, grid_size):
     """
     Generates starting positions for players by dividing the grid into
     regions based on the number of clients. (Logic remains sound)
+    Not cached: the server draws a fresh set for every game.
     """
-    positions = {}
-
-
     dim = max(2, int(max_clients ** 0.5 + 0.999))  # Ensure minimum 2x2 grid
 
     cell_width = grid_size // dim
     cell_height = grid_size // dim
 
-    for i in range(max_clients):
-        row_idx = i // dim
-        col_idx = i % dim
+    # One vectorized draw for every client instead of two randint calls each
+    row_idx, col_idx = np.divmod(np.arange(max_clients), dim)
 
-        # Define the safe region within the cell for random placement
-        min_x = int(col_idx * cell_width + 2)
-        max_x = int((col_idx + 1) * cell_width - 2)
-        min_y = int(row_idx * cell_height + 2)
-        max_y = int((row_idx + 1) * cell_height - 2)
+    # Define the safe region within the cell for random placement
+    min_x = col_idx * cell_width + 2
+    max_x = (col_idx + 1) * cell_width - 2
+    min_y = row_idx * cell_height + 2
+    max_y = (row_idx + 1) * cell_height - 2
 
-        if min_x < max_x and min_y < max_y:
-            x = random.randint(min_x, max_x)
-            y = random.randint(min_y, max_y)
-        else:
-            x = random.randint(1, grid_size - 1)
-            y = random.randint(1, grid_size - 1)
+    rng = np.random.default_rng()
+    xs = rng.integers(min_x, np.maximum(min_x, max_x) + 1)
+    ys = rng.integers(min_y, np.maximum(min_y, max_y) + 1)
 
-        positions[i] = (x, y)
+    # Cells too small for a safe region fall back to anywhere on the grid
+    safe = (min_x < max_x) & (min_y < max_y)
+    xs = np.where(safe, xs, rng.integers(1, grid_size, max_clients))
+    ys = np.where(safe, ys, rng.integers(1, grid_size, max_clients))
 
+    positions = dict(enumerate(zip(xs.tolist(), ys.tolist())))
     positions['default'] = (grid_size // 2, grid_size // 2)
     return positions
 
 
-PLAYER_POSITIONS = generate_player_positions(MAX_CLIENTS, GRID_SIZE)
-
 WINNING_THRESHOLD = MAX_CLIENTS * 50
 #############################################
 ############ Client Constants ###############
@@ -111,50 +110,62 @@ BUTTON_HOVER_COLOR = (100, 149, 237)
 STRIP_BG_COLOR = (240, 240, 240)
 
 
-def generate_player_colors(max_clients):
-    # ... (Color generation function remains the same) ...
-    colors = {}
-    base_colors = {
-        0: (255, 0, 0),  # Red
-        1: (0, 0, 255),  # Blue
-        2: (0, 255, 0),  # Green
-        3: (255, 255, 0)  # Yellow
-    }
+DEFAULT_PLAYER_COLOR = (100, 100, 100)
+
 
+# Per HSV sector (int(h)), the index into (c, x, 0) for each of r, g, b
+_HSV_TABLE = np.array([(0, 1, 2), (1, 0, 2), (2, 0, 1), (2, 1, 0), (1, 2, 0), (0, 2, 1)], dtype=np.intp)
+
+
+def generate_player_colors_array(max_clients):
+    """
+    Returns a (max_clients, 3) uint8 array of player colors, row i = RGB of player i.
+    Up to 4 players use the fixed base colors, otherwise hues are spread evenly around the wheel.
+    """
     if max_clients <= 4:
-        colors = base_colors
-    else:
-        for i in range(max_clients):
-            hue = int((i * 360 / max_clients) % 360)
-            h = hue / 60.0
-            c = 255
-            x = int(c * (1 - abs(h % 2 - 1)))
-
-            r, g, b = 0, 0, 0
-            # RGB calculation block...
-            if 0 <= h < 1: r, g, b = c, x, 0
-            elif 1 <= h < 2: r, g, b = x, c, 0
-            elif 2 <= h < 3: r, g, b = 0, c, x
-            elif 3 <= h < 4: r, g, b = 0, x, c
-            elif 4 <= h < 5: r, g, b = x, 0, c
-            elif 5 <= h < 6: r, g, b = c, 0, x
-
-            colors[i] = (r, g, b)
-
-    colors['default'] = (100, 100, 100)
+        base_colors = np.array([
+            (255, 0, 0),  # Red
+            (0, 0, 255),  # Blue
+            (0, 255, 0),  # Green
+            (255, 255, 0)  # Yellow
+        ], dtype=np.uint8)
+        return base_colors[:max_clients].copy()
+
+    # Vectorized HSV -> RGB (full saturation/value), one row per player
+    i = np.arange(max_clients)
+    hue = np.floor((i * 360 / max_clients) % 360)
+    h = hue / 60.0
+    c = 255
+    x = (c * (1 - np.abs(h % 2 - 1))).astype(np.int32)
+    sector = h.astype(np.int32) % 6
+
+    # Table-driven instead of a branch per sector: gather (r, g, b) out of (c, x, 0)
+    vals = np.stack([np.full(max_clients, c), x, np.zeros(max_clients, dtype=np.int32)], axis=1)
+    channels = _HSV_TABLE[sector]
+    return vals[np.arange(max_clients)[:, None], channels].astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def generate_player_colors(max_clients):
+    """Player id -> (r, g, b) dict built from generate_player_colors_array, plus a 'default' entry."""
+    colors = dict(enumerate(map(tuple, generate_player_colors_array(max_clients).tolist())))
+    colors['default'] = DEFAULT_PLAYER_COLOR
     return colors
 
 
+# Array form for hot rendering paths (index by player id), dict form for everything else
+PLAYER_COLORS_ARR = generate_player_colors_array(MAX_CLIENTS)
 PLAYER_COLORS = generate_player_colors(MAX_CLIENTS)
 
 # Connection timeout
 CONNECTION_TIMEOUT = 10.0  # seconds
 
-# Verify the dynamic values for the user
-print(f"--- Configuration Summary (MAX_CLIENTS={MAX_CLIENTS}) ---")
-print(f"GRID_SIZE: {GRID_SIZE}x{GRID_SIZE}")
-print(f"CELL_SIZE: {CELL_SIZE}")
-print(f"SCREEN_WIDTH: {SCREEN_WIDTH}")
-print(f"SCREEN_HEIGHT: {SCREEN_HEIGHT}")
-print(f"Generated Positions: {PLAYER_POSITIONS}")
-print(f"Generated Colors: {PLAYER_COLORS}")
\ No newline at end of file
+# Verify the dynamic values for the user (run this module directly; nothing is printed on import)
+if __name__ == "__main__":
+    print(f"--- Configuration Summary (MAX_CLIENTS={MAX_CLIENTS}) ---")
+    print(f"GRID_SIZE: {GRID_SIZE}x{GRID_SIZE}")
+    print(f"CELL_SIZE: {CELL_SIZE}")
+    print(f"SCREEN_WIDTH: {SCREEN_WIDTH}")
+    print(f"SCREEN_HEIGHT: {SCREEN_HEIGHT}")
+    print(f"Generated Positions: {generate_player_positions(MAX_CLIENTS, GRID_SIZE)}")
+    print(f"Generated Colors: {PLAYER_COLORS}")
\ No newline at end of file
@@ -12,9 +12,9 @@ This module contains the protocol definition for the GridClash project.
     - I: checksum (4 bytes, uint32, big-endian)
     Total: 4+1+1+4+4+8+2+4 = 28 bytes
 """
-import binascii
 import struct
 import time
+import zlib
 from collections import namedtuple
 from enum import IntEnum
 
@@ -23,10 +23,29 @@ PROTOCOL_VERSION = 1
 HEADER_FORMAT = "!4sBBIIQHI"  # using checksum CRC32
 HEADER_SIZE = struct.calcsize(HEADER_FORMAT)  # 28 bytes
 
+# Precompiled so the format string is parsed once, not on every packet
+_HDR = struct.Struct(HEADER_FORMAT)
+_PREFIX = struct.pack("!4sB", PROTOCOL_ID, PROTOCOL_VERSION)  # protocol_id + version
+SEQ_NUM_OFFSET = struct.calcsize("!4sBBI")  # after protocol_id, version, msg_type, snapshot_id
+CHECKSUM_OFFSET = HEADER_SIZE - 4  # checksum is the last header field
+_ZERO_CHECKSUM = bytes(4)
+_U32 = struct.Struct("!I")
+
+# Same CRC-32 as binascii.crc32, but zlib's implementation uses the SIMD
+# (PCLMULQDQ folding) kernels when CPython is linked against a modern zlib/zlib-ng
+_crc32 = zlib.crc32
+
 # Grid constants
 
 UNCLAIMED_ID = 255  # Special value indicating a cell has no owner
 
+# DELTA_SNAPSHOT payload: DELTA_HEAD, then count DELTA_CELL records, then the player count and
+# player records exactly as in a SNAPSHOT. Cells are cumulative since the keyframe (the SNAPSHOT
+# with snapshot_id == base), so one lost delta costs nothing; a lost keyframe only stalls the
+# grid until the next one.
+DELTA_HEAD = struct.Struct("!IB")  # base keyframe snapshot_id, changed-cell count
+DELTA_CELL = struct.Struct("!HB")  # flat cell index (row * GRID_WIDTH + col), owner id
+
 
 class MessageType(IntEnum):
     """Message types for the GridClash protocol."""
@@ -42,6 +61,7 @@ class MessageType(IntEnum):
     SERVER_FULL = 7  # server -> client (server full)
     ACK = 8          # ←  RELIABILITY CODE
     NACK = 9        # ←  RELIABILITY CODE
+    DELTA_SNAPSHOT = 10  # Server → Client (cells changed since the last keyframe SNAPSHOT)
 
 # used a namedtuple instead of class for simplicity
 packet = namedtuple(
@@ -53,8 +73,7 @@ packet = namedtuple(
 # modify the function to be this order: HEADER_FORMAT, PROTOCOL_ID, PROTOCOL_VERSION, msg_type, snapshot_id, seq_num, server_timestamp, payload_len, checksum
 def create_header(msg_type, snapshot_id, seq_num, server_timestamp, payload_len, checksum=0):
     """Create packet header."""
-    return struct.pack(
-        HEADER_FORMAT,
+    return _HDR.pack(
         PROTOCOL_ID,
         PROTOCOL_VERSION,
         msg_type,
@@ -68,20 +87,29 @@ def create_header(msg_type, snapshot_id, seq_num, server_timestamp, payload_len,
 
 def parse_header(header_bytes):
     """Parse packet header."""
-    return struct.unpack(HEADER_FORMAT, header_bytes)
+    return _HDR.unpack_from(header_bytes, 0)
 
 
 def unpack_packet(data):
-    """Unpack raw data into packet object with multiple verifications."""
+    """
+    Unpack raw data into packet object with multiple verifications.
+    The returned payload is a memoryview into data (no copy).
+    """
     # check for minimum length
     if len(data) < HEADER_SIZE:
         raise ValueError("Incomplete packet")
 
-    # extract header and payload
-    header_bytes = data[:HEADER_SIZE]
-    payload = data[HEADER_SIZE:]
+    # extract header (read in place, no slice) and payload (zero-copy view)
+    mv = memoryview(data)
+
+    # verify protocol ID + version with a single compare, before any parsing or CRC work
+    if mv[:len(_PREFIX)] != _PREFIX:
+        if mv[:len(PROTOCOL_ID)] != PROTOCOL_ID:
+            raise ValueError("Invalid Protocol ID")
+        raise ValueError("Unsupported Protocol Version")
 
-    unpacked_header = parse_header(header_bytes)
+    unpacked_header = _HDR.unpack_from(mv, 0)
+    payload = mv[HEADER_SIZE:]
 
     payload_len = unpacked_header[6]
     received_checksum = unpacked_header[7]
@@ -90,24 +118,11 @@ def unpack_packet(data):
     if len(payload) != payload_len:
         raise ValueError("Payload length mismatch")
 
-    # verify protocol ID
-    if unpacked_header[0] != PROTOCOL_ID:
-        raise ValueError("Invalid Protocol ID")
-
-    # verify protocol version
-    if unpacked_header[1] != PROTOCOL_VERSION:
-        raise ValueError("Unsupported Protocol Version")
-
-    # verify checksum
-    temp_header = create_header(
-        unpacked_header[2],  # msg_type
-        unpacked_header[3],  # snapshot_id
-        unpacked_header[4],  # seq_num
-        unpacked_header[5],  # server_timestamp
-        unpacked_header[6],  # payload_len
-        0  # checksum set to 0 for calculation
-    )
-    calculated_checksum = calculate_checksum(temp_header + payload)
+    # verify checksum: CRC the header with its checksum field zeroed, then continue
+    # the same CRC over the payload (no header + payload concatenation)
+    temp_header = bytearray(mv[:HEADER_SIZE])
+    temp_header[CHECKSUM_OFFSET:] = _ZERO_CHECKSUM
+    calculated_checksum = _crc32(payload, _crc32(temp_header)) & 0xffffffff
     if calculated_checksum != received_checksum:
         raise ValueError("Checksum mismatch")
 
@@ -127,16 +142,45 @@ def unpack_packet(data):
 
 def pack_packet(msg_type, snapshot_id, seq_num, server_timestamp, payload):
     """Pack packet fields and payload into raw bytes."""
+    # CRC the zero-checksum header then the payload, and pack the final header directly; for the
+    # small control packets this beats staging everything in a bytearray and copying it out again
     payload_len = len(payload)
-    temp_header = create_header(msg_type, snapshot_id, seq_num, server_timestamp, payload_len, 0)
-    checksum = calculate_checksum(temp_header + payload)
-    final_header = create_header(msg_type, snapshot_id, seq_num, server_timestamp, payload_len, checksum)
-    return final_header + payload
+    checksum = _crc32(payload, _crc32(_HDR.pack(PROTOCOL_ID, PROTOCOL_VERSION, msg_type, snapshot_id, seq_num,
+                                                server_timestamp, payload_len, 0))) & 0xffffffff
+    return _HDR.pack(PROTOCOL_ID, PROTOCOL_VERSION, msg_type, snapshot_id, seq_num, server_timestamp,
+                     payload_len, checksum) + payload
+
+
+def pack_packet_into(buf, msg_type, snapshot_id, seq_num, server_timestamp, checksum=True):
+    """
+    Write the header (including checksum) into buf, whose payload is already at buf[HEADER_SIZE:].
+    buf must be a bytearray (or writable memoryview) of exactly HEADER_SIZE + payload length bytes.
+    With checksum=False the checksum field is left 0, for a buf that is never sent itself but only
+    used as the template for stamp_header_into (which computes each copy's checksum).
+    """
+    # Pack the header once with checksum=0, CRC header+payload, then patch the checksum in place
+    _HDR.pack_into(buf, 0, PROTOCOL_ID, PROTOCOL_VERSION, msg_type, snapshot_id, seq_num, server_timestamp,
+                   len(buf) - HEADER_SIZE, 0)
+    if checksum:
+        _U32.pack_into(buf, CHECKSUM_OFFSET, calculate_checksum(buf))
+
+
+def stamp_header_into(header, packet_buf, seq_num):
+    """
+    Copy the header of a packet built by pack_packet_into into header (a HEADER_SIZE bytearray),
+    re-stamped with seq_num and with its checksum refreshed, so the payload
+    (packet_buf[HEADER_SIZE:]) can stay shared.
+    """
+    header[:] = packet_buf[:HEADER_SIZE]
+    _U32.pack_into(header, SEQ_NUM_OFFSET, seq_num)
+    header[CHECKSUM_OFFSET:] = _ZERO_CHECKSUM
+    checksum = _crc32(memoryview(packet_buf)[HEADER_SIZE:], _crc32(header)) & 0xffffffff
+    _U32.pack_into(header, CHECKSUM_OFFSET, checksum)
 
 
 def calculate_checksum(data):
     """Calculate CRC32 checksum."""
-    return binascii.crc32(data) & 0xffffffff
+    return _crc32(data) & 0xffffffff
 
 
 def get_current_timestamp_ms():
@@ -1,18 +1,81 @@
 """Server for GridClash game."""
+import heapq
 import os
+import selectors
 import socket
 import struct
 import sys
 import time
+from array import array
+
+import numpy as np
 
 # import from parent directory
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from src.protocol import pack_packet, MessageType, get_current_timestamp_ms, unpack_packet, UNCLAIMED_ID
-from src.constants import DEFAULT_PORT, GRID_SIZE, MAX_PACKET_SIZE, PLAYER_POSITIONS, MAX_CLIENTS, GRID_WIDTH, \
-    GRID_HEIGHT, WINNING_THRESHOLD
+from src.protocol import pack_packet, MessageType, get_current_timestamp_ms, unpack_packet, UNCLAIMED_ID, \
+    HEADER_SIZE, pack_packet_into, stamp_header_into, DELTA_HEAD, DELTA_CELL
+from src.constants import DEFAULT_PORT, GRID_SIZE, MAX_PACKET_SIZE, MAX_CLIENTS, GRID_WIDTH, \
+    GRID_HEIGHT, WINNING_THRESHOLD, generate_player_positions
+from src.mmsg import MultiSender, MultiReceiver, pack_sockaddr
+
+# Max datagrams pulled from the socket per receive syscall
+RECV_BATCH = 32
+
+# Kernel socket buffer size requested for both directions, so a burst of ACQUIREs (or a
+# scheduling hiccup) is absorbed instead of dropped; Linux caps it at net.core.{r,w}mem_max
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Precompiled formats for the other packets (parsed once, not on every pack/unpack)
+_COUNT = struct.Struct('!B')  # SERVER_FULL payload
+_HELLO_RESP = struct.Struct('!Bii')  # player_id, start x, start y
+_ACQUIRE = struct.Struct('!BB')  # row, col
+_ACK = struct.Struct('!I?')  # seq_num, True=ACK / False=NACK
+_GAMEOVER = struct.Struct('!BH')  # winner_id, winner_score
+
+# Per-player snapshot record, big-endian and unpadded to match '!BHiiii' (19 bytes)
+_PLAYER_DTYPE = np.dtype([('pid', '>u1'), ('score', '>u2'), ('x', '>i4'), ('y', '>i4'), ('dx', '>i4'), ('dy', '>i4')])
+
+# try_acquire results
+ACQUIRE_TAKEN = -1  # owned by another player
+ACQUIRE_OWNED = 0  # already owned by the requester
+ACQUIRE_CLAIMED = 1
+
+# Delta snapshots: a full SNAPSHOT (keyframe) goes out every KEYFRAME_INTERVAL broadcasts, when a
+# client joins or the game resets, or once more than DELTA_MAX_CELLS cells changed since the last
+# one (the count must fit DELTA_HEAD's byte); the broadcasts in between are DELTA_SNAPSHOTs
+KEYFRAME_INTERVAL = 20  # one per second at 20 Hz
+DELTA_MAX_CELLS = 100
+
+# Duplicate suppression: per client, the highest ACQUIRE seq_num seen plus a bitmask of the
+# SEQ_WINDOW seq_nums at and below it (bit i set => hi_seq - i already processed)
+SEQ_WINDOW = 64
+_SEQ_WINDOW_MASK = (1 << SEQ_WINDOW) - 1
+
+# _seq_state results
+SEQ_NEW = 0  # not processed yet
+SEQ_DUPLICATE = 1  # already processed (re-ACK it)
+SEQ_TOO_OLD = 2  # below the window: unknown whether it was processed, so drop it
+
+
+def _seq_state(hi_seq, window, seq):
+    """Classify seq as SEQ_NEW, SEQ_DUPLICATE or SEQ_TOO_OLD, given a client's hi_seq/window."""
+    diff = hi_seq - seq
+    if diff < 0:
+        return SEQ_NEW  # newer than anything seen so far
+    if diff >= SEQ_WINDOW:
+        return SEQ_TOO_OLD
+    return SEQ_DUPLICATE if (window >> diff) & 1 else SEQ_NEW
+
+
+def _mark_seq(hi_seq, window, seq):
+    """Record seq as processed; returns the new (hi_seq, window), slid forward if seq is the newest."""
+    diff = seq - hi_seq
+    if diff > 0:
+        return seq, ((window << diff) | 1) & _SEQ_WINDOW_MASK
+    return hi_seq, window | (1 << -diff)
 
 
 class GridServer:
@@ -38,22 +101,68 @@ class GridServer:
 
         # Socket setup
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
         self.socket.bind(('', self.port))
         self.socket.setblocking(False)
+        # Snapshots for every client go out in one sendmmsg call (sendto loop off Linux)
+        self.sender = MultiSender(self.socket, self.max_clients, HEADER_SIZE)
+        # Queued requests are drained up to RECV_BATCH per recvmmsg call (recvfrom loop off Linux)
+        self.receiver = MultiReceiver(self.socket, RECV_BATCH, self.max_packet_size)
 
         # State
-        self.clients = {}
         self.next_player_id = 0
         self.snapshot_id = 0
         self.seq_num = 0
-        self.active_clients_ids = []
-        self.clients_pos = {}
-        # Grid state: 400 bytes (20x20), each cell stores owner ID (255 = unclaimed)
-        self.grid_state = bytearray([UNCLAIMED_ID] * (GRID_WIDTH * GRID_HEIGHT))
-        self.grid_ts = [[0 for _ in range(GRID_HEIGHT)] for _ in range(GRID_WIDTH)]  # ← CRITICAL: Timestamp per cell
-        self.scores = {}  # {player_id: score}
+
+        # Per-client state as parallel arrays indexed by player_id (slot). addrs[pid] is None while
+        # the slot is free; addr_to_pid maps a client address back to its slot.
+        n = self.max_clients
+        self.addr_to_pid = {}
+        self.addrs = [None] * n
+        self._used_mask = 0  # bit pid set while slot pid is taken
+        self._all_slots_mask = (1 << n) - 1
+        # Packed once per client so broadcasts never re-parse the (host, port) tuple. A connected
+        # per-client socket would do the same for send(), but it needs its own local port and
+        # clients only accept packets whose source is exactly the server address.
+        self.sockaddrs = [None] * n
+        self.seq = array('I', [0]) * n  # last snapshot/game-over seq_num sent
+        self.last_heartbeat = array('d', [0.0]) * n
+        # Min-heap of (expiry_time, pid, address), one entry per heartbeat; entries made stale by a
+        # newer heartbeat or a disconnect are skipped when they reach the top (lazy deletion)
+        self._expiry_heap = []
+        self.hi_seq = array('I', [0]) * n  # duplicate suppression, see _seq_state
+        self.seq_window = array('Q', [0]) * n
+        self.score = array('H', [0]) * n
+        # Cursor position; a slot keeps its last position when its player leaves (a new player
+        # taking the slot starts there), and is set back to the spawn point on reset
+        self.pos_x = array('i', [0]) * n
+        self.pos_y = array('i', [0]) * n
+        self.prev_x = array('i', [0]) * n  # position at the previous broadcast (delta encoding)
+        self.prev_y = array('i', [0]) * n
+        self.reset_positions()
+        self._total_cells = GRID_WIDTH * GRID_HEIGHT
+
+        # Snapshot packet buffer sized for a full server, allocated once; the grid and player-record
+        # regions are NumPy views into it
+        self._snapshot_buf = bytearray(HEADER_SIZE + self._total_cells + 1 + self.max_clients * _PLAYER_DTYPE.itemsize)
+        # Grid state: 400 bytes (20x20 uint8 array), each cell stores owner ID (255 = unclaimed).
+        # It lives inside the snapshot buffer, so a claim is written straight into the next
+        # snapshot and broadcasts never copy the grid.
+        self.grid_state = np.frombuffer(self._snapshot_buf, dtype=np.uint8, count=self._total_cells,
+                                        offset=HEADER_SIZE).reshape(GRID_HEIGHT, GRID_WIDTH)
+        self.grid_state.fill(UNCLAIMED_ID)
+        self._snapshot_players = np.frombuffer(self._snapshot_buf, dtype=_PLAYER_DTYPE, count=self.max_clients,
+                                               offset=HEADER_SIZE + self._total_cells + 1)
+        # Flat indices of the cells claimed since the last keyframe, and the DELTA_SNAPSHOT buffer
+        # sized for DELTA_MAX_CELLS of them and a full server
+        self._dirty = set()
+        self._delta_buf = bytearray(HEADER_SIZE + DELTA_HEAD.size + DELTA_MAX_CELLS * DELTA_CELL.size + 1 +
+                                    self.max_clients * _PLAYER_DTYPE.itemsize)
+        self._keyframe_id = 0  # snapshot_id of the last keyframe, the base every delta refers to
+        self._ticks_since_keyframe = 0
+        self._keyframe_due = True
         self.game_active = True
-        self.claimed_cells = 0
         self.winner_id = None
         self.winner_score = 0
 
@@ -61,26 +170,43 @@ class GridServer:
         print(f"[SERVER] Grid size: {grid_size}x{grid_size}")
         print(f"[SERVER] Server is up and running on port {self.port}")
 
+    @property
+    def claimed_cells(self):
+        """Number of owned cells, counted from the grid bytes (a C-level scan, no counter to keep in sync)."""
+        return self._total_cells - self._snapshot_buf.count(UNCLAIMED_ID, HEADER_SIZE, HEADER_SIZE + self._total_cells)
+
+    def grid_full(self):
+        """True once no cell is unclaimed; memchr stops at the first free cell."""
+        return self._snapshot_buf.find(UNCLAIMED_ID, HEADER_SIZE, HEADER_SIZE + self._total_cells) == -1
+
     def get_available_player_id(self):
-        used_ids = self.active_clients_ids.copy()
-        for pid in range(self.max_clients):
-            if pid not in used_ids:
-                return pid
-        return None  # server full
+        free = ~self._used_mask & self._all_slots_mask
+        if not free:
+            return None  # server full
+        return (free & -free).bit_length() - 1  # lowest free slot
+
+    def reset_positions(self):
+        """Draw fresh spawn points for this game and put every slot back on its own."""
+        positions = generate_player_positions(self.max_clients, GRID_SIZE)
+        # Every slot has its own spawn point, so a tuple indexed by pid replaces the dict + default
+        self.spawn = tuple(positions[pid] for pid in range(self.max_clients))
+        for pid, (x, y) in enumerate(self.spawn):
+            self.pos_x[pid] = x
+            self.pos_y[pid] = y
 
     def handle_client_hello(self, client_address):
         """INIT handshake with client"""
         if self.game_active:
 
             # checks if player is already connected
-            if client_address in self.clients:
+            if client_address in self.addr_to_pid:
                 print(f"{client_address} already connected.")
                 return
 
             # check if server is full
-            if len(self.active_clients_ids) >= self.max_clients:
+            if len(self.addr_to_pid) >= self.max_clients:
                 print(f"Server full. connection declined with {client_address}")
-                payload = struct.pack('!B', 0)
+                payload = _COUNT.pack(0)
 
                 response_packet = pack_packet(MessageType.SERVER_FULL, 0, 0, get_current_timestamp_ms(),
                                               payload)
@@ -89,43 +215,36 @@ class GridServer:
             # find id of disconnected player to give
             player_id = self.get_available_player_id()
 
-
-            if player_id in self.clients_pos:
-                pos = self.clients_pos[player_id]
-            else:
-                pos = PLAYER_POSITIONS.get(player_id, PLAYER_POSITIONS['default'])
-
-            self.clients_pos[player_id] = pos
-
-            self.clients[client_address] = {
-                'player_id': player_id,
-                'seq_num': 0,
-                'last_heartbeat': time.time(),
-                'pos': pos, # starting position
-                'processed_seqs': set()
-            }
-            self.active_clients_ids.append(player_id)
-            if player_id not in self.scores:
-                self.scores[player_id] = 0
+            self.addr_to_pid[client_address] = player_id
+            self.addrs[player_id] = client_address
+            self._used_mask |= 1 << player_id
+            self.sockaddrs[player_id] = pack_sockaddr(client_address)
+            self.seq[player_id] = 0
+            self.touch_client(player_id)
+            self.hi_seq[player_id] = 0
+            self.seq_window[player_id] = 0
+            # starting position: where this slot's last player was, or its spawn point
+            pos_x, pos_y = self.pos_x[player_id], self.pos_y[player_id]
+            self.prev_x[player_id], self.prev_y[player_id] = pos_x, pos_y
             self.next_player_id += 1
             print(f"{client_address} connected. player_id {player_id}")
 
             # respond with server hello message
-            pos_x, pos_y = self.clients[client_address]['pos']
-
-            payload = struct.pack('!Bii', player_id, pos_x, pos_y) # 9 bytes
+            payload = _HELLO_RESP.pack(player_id, pos_x, pos_y) # 9 bytes
             #payload = struct.pack('!B', player_id)  # as max is 4
             response_packet = pack_packet(MessageType.SERVER_INIT_RESPONSE, 0, 0, get_current_timestamp_ms(),
                                           payload)
             self.socket.sendto(response_packet, client_address)
             self.acquire_cell(pos_x, pos_y, player_id)
+            # the new client has no grid to apply deltas to yet
+            self._keyframe_due = True
         else:
             print(f"Game over. connection Declined with {client_address}")
             # send current state
             self.send_current_state(client_address)
             current_timestamp = get_current_timestamp_ms()
             #send winner data
-            payload = struct.pack('!BH', self.winner_id, self.winner_score)
+            payload = _GAMEOVER.pack(self.winner_id, self.winner_score)
             packet = pack_packet(MessageType.GAME_OVER, self.snapshot_id, 0, current_timestamp,
                                  payload)
             self.socket.sendto(packet, client_address)
@@ -134,37 +253,56 @@ class GridServer:
 
     # updating client heartbeat
     def handle_client_heartbeat(self, client_address):
-        if client_address in self.clients:
-            self.clients[client_address]['last_heartbeat'] = time.time()
+        player_id = self.addr_to_pid.get(client_address)
+        if player_id is not None:
+            self.touch_client(player_id)
+
+    def touch_client(self, player_id):
+        """Record a sign of life from player_id and schedule its expiry."""
+        now = time.time()
+        self.last_heartbeat[player_id] = now
+        heapq.heappush(self._expiry_heap, (now + self.heartbeat_timeout, player_id, self.addrs[player_id]))
+
+    def next_expiry(self):
+        """Earliest time a client could time out (inf with no clients)."""
+        return self._expiry_heap[0][0] if self._expiry_heap else float('inf')
 
     # timeout handling
     def handle_timeout(self):
         current_time = time.time()
-        timed_out_clients = []
-        for clientAddress, clientData in self.clients.items():
-            if current_time - clientData['last_heartbeat'] > self.heartbeat_timeout:
-                timed_out_clients.append(clientAddress)
-
-        # remove timed out clients
-        for clientAddress in timed_out_clients:
-            player_id = self.clients[clientAddress]['player_id']
-            print(f"{clientAddress} timed out (Player {player_id})")
-            if player_id in self.active_clients_ids:
-                self.active_clients_ids.remove(player_id)
-            del self.clients[clientAddress]
+        heap = self._expiry_heap
+        # Only entries that have expired are looked at; usually that is none, so this is a peek
+        while heap and heap[0][0] < current_time:
+            _, player_id, clientAddress = heapq.heappop(heap)
+            # stale: the slot was freed/reused, or a later heartbeat pushed a newer entry
+            if self.addrs[player_id] != clientAddress:
+                continue
+            if self.last_heartbeat[player_id] + self.heartbeat_timeout < current_time:
+                # remove timed out client
+                print(f"{clientAddress} timed out (Player {player_id})")
+                self.addrs[player_id] = None
+                self._used_mask &= ~(1 << player_id)
+                self.sockaddrs[player_id] = None
+                del self.addr_to_pid[clientAddress]
 
     def handle_acquire_request(self, client_address, payload, packet_seq_num):
         """Handle ACQUIRE_REQUEST with reliability (ACKs) and Duplicate Suppression."""
         
-        if not self.game_active or client_address not in self.clients:
+        if not self.game_active:
+            return
+        player_id = self.addr_to_pid.get(client_address)
+        if player_id is None:
             return
-    
-        client = self.clients[client_address]
     
     # Duplicate suppression
-        if packet_seq_num in client['processed_seqs']:
+        seq_state = _seq_state(self.hi_seq[player_id], self.seq_window[player_id], packet_seq_num)
+        if seq_state == SEQ_TOO_OLD:
+            # Neither ACK nor NACK: an ACK for a request that was never applied would move the
+            # client to a cell the server never gave it
+            return
+        if seq_state == SEQ_DUPLICATE:
         # Re-send previous ACK/NACK if needed
-            prev_ack_payload = struct.pack('!I?', packet_seq_num, True)  # True=ACK
+            prev_ack_payload = _ACK.pack(packet_seq_num, True)  # True=ACK
             ack_packet = pack_packet(MessageType.ACK, self.snapshot_id, 0, get_current_timestamp_ms(), prev_ack_payload)
             self.socket.sendto(ack_packet, client_address)
             return
@@ -172,47 +310,54 @@ class GridServer:
     # Payload unpack
         if len(payload) < 2:
             return
-        row, col = struct.unpack('!BB', payload[:2])
+        row, col = _ACQUIRE.unpack_from(payload, 0)
         if row >= GRID_HEIGHT or col >= GRID_WIDTH:
             return
 
-        index = row * GRID_WIDTH + col
-        player_id = client['player_id']
-        success = False
-
     # Check cell ownership
-        if self.grid_state[index] == UNCLAIMED_ID:
-            self.grid_state[index] = player_id
-            self.scores[player_id] = self.scores.get(player_id, 0) + 1
-            self.claimed_cells += 1
-            success = True
+        result = self.try_acquire(row, col, player_id)
+        success = result >= 0  # NACK only if the cell is claimed by another player
+        if result == ACQUIRE_CLAIMED:
             print(f"[ACQUIRE] Player {player_id} claimed ({row},{col})")
-        elif self.grid_state[index] == player_id:
-            success = True  # Already owned
-    # else success=False (cell claimed by another player)
 
     # Update position regardless
-        client['pos'] = (col, row)
-        self.clients_pos[player_id] = (col, row)
+        self.pos_x[player_id] = col
+        self.pos_y[player_id] = row
 
     # Mark processed
-        client['processed_seqs'].add(packet_seq_num)
+        self.hi_seq[player_id], self.seq_window[player_id] = _mark_seq(
+            self.hi_seq[player_id], self.seq_window[player_id], packet_seq_num)
 
     # Send selective ACK/NACK
-        ack_payload = struct.pack('!I?', packet_seq_num, success)  # bool: True=ACK, False=NACK
+        ack_payload = _ACK.pack(packet_seq_num, success)  # bool: True=ACK, False=NACK
         ack_packet = pack_packet(MessageType.ACK, self.snapshot_id, 0, get_current_timestamp_ms(), ack_payload)
         self.socket.sendto(ack_packet, client_address)
 
-    # Check game over
-        if self.claimed_cells >= GRID_WIDTH * GRID_HEIGHT or self.scores[player_id] >= WINNING_THRESHOLD:
+    # Check game over (only a new claim can change the outcome)
+        if result == ACQUIRE_CLAIMED and (self.score[player_id] >= WINNING_THRESHOLD or self.grid_full()):
             self.broadcast_game_over()
 
-    def acquire_cell(self, col, row, player_id):
-        index = row * GRID_WIDTH + col
+    def try_acquire(self, row, col, player_id):
+        """
+        Claim the in-bounds cell (row, col) for player_id if it is unclaimed.
+        Returns ACQUIRE_CLAIMED, ACQUIRE_OWNED (already player_id's) or ACQUIRE_TAKEN (another player's).
+        """
+        # Reads and writes the grid's backing bytearray: a plain byte index is several times
+        # cheaper than a NumPy 2-D scalar lookup, which builds an index tuple and a NumPy scalar
+        index = HEADER_SIZE + row * GRID_WIDTH + col
+        buf = self._snapshot_buf
+        owner = buf[index]
+        if owner == UNCLAIMED_ID:
+            buf[index] = player_id
+            self.score[player_id] += 1
+            self._dirty.add(index - HEADER_SIZE)
+            return ACQUIRE_CLAIMED
+        return ACQUIRE_OWNED if owner == player_id else ACQUIRE_TAKEN
 
-        self.grid_state[index] = player_id
-        self.scores[player_id] = self.scores.get(player_id, 0) + 1
-        self.claimed_cells += 1
+    def acquire_cell(self, col, row, player_id):
+        self.grid_state[row, col] = player_id
+        self._dirty.add(row * GRID_WIDTH + col)
+        self.score[player_id] += 1
 
 
 
@@ -220,100 +365,158 @@ class GridServer:
         """Broadcast GAME_OVER to all clients."""
         self.game_active = False
         
-        # Find winner (highest score)
-
-        self.winner_id = 0  # Default to player 0
-        for player_id, score in self.scores.items():
-            if score > self.winner_score:
-                self.winner_id = player_id
-                self.winner_score = score
+        # Find winner (most owned cells) with one pass over the grid; ties and an empty grid go to
+        # the lowest player id, matching the old default of player 0. Unclaimed cells land in their
+        # own bin (UNCLAIMED_ID) and are sliced off, so no mask/copy of the grid is needed.
+        counts = np.bincount(self.grid_state.ravel(), minlength=UNCLAIMED_ID + 1)[:self.max_clients]
+        self.winner_id = int(counts.argmax())
+        self.winner_score = int(counts[self.winner_id])
         
         print(f"[GAME OVER] Winner: Player {self.winner_id} with score {self.winner_score}")
         
-        payload = struct.pack('!BH', self.winner_id, self.winner_score)
+        payload = _GAMEOVER.pack(self.winner_id, self.winner_score)
         current_timestamp = get_current_timestamp_ms()
-        clients_snapshot = list(self.clients.items())
-        for clientAddress, clientData in clients_snapshot:
-            clientData['seq_num'] += 1
-            packet = pack_packet(MessageType.GAME_OVER, self.snapshot_id, clientData['seq_num'], current_timestamp, payload)
-            self.socket.sendto(packet, clientAddress)
+        seq, snapshot_id, sendto = self.seq, self.snapshot_id, self.socket.sendto
+        for player_id, clientAddress in enumerate(self.addrs):
+            if clientAddress is None:
+                continue
+            seq[player_id] += 1
+            packet = pack_packet(MessageType.GAME_OVER, snapshot_id, seq[player_id], current_timestamp, payload)
+            sendto(packet, clientAddress)
 
     # DATA broadcast
+    def write_player_records(self, out, track_deltas):
+        """
+        Fill out[:number of connected clients] (a _PLAYER_DTYPE array) with the snapshot player records.
+        With track_deltas, dX/dY are the movement since the last broadcast and the previous position
+        is advanced; otherwise they are zero and it is left alone.
+        """
+        # One pass over the slot arrays building plain tuples, then a single structured assignment.
+        # Arrays are bound to locals so the loop does no attribute lookups.
+        pos_x, pos_y, prev_x, prev_y, score = self.pos_x, self.pos_y, self.prev_x, self.prev_y, self.score
+        rows = []
+        append = rows.append
+        for player_id, clientAddress in enumerate(self.addrs):
+            if clientAddress is None:
+                continue
+            x = pos_x[player_id]
+            y = pos_y[player_id]
+            if track_deltas:
+                # ← DELTA ENCODING
+                dx = x - prev_x[player_id]
+                dy = y - prev_y[player_id]
+                prev_x[player_id] = x  # Save for next
+                prev_y[player_id] = y
+            else:
+                dx = dy = 0
+            append((player_id, score[player_id], x, y, dx, dy))
+        out[:len(rows)] = rows
+
+    def write_keyframe(self):
+        """Fill in the snapshot buffer's player count and records; returns the used length."""
+        # Keyframe payload structure:
+        # 1. Grid data: 400 bytes (20x20 flat array, 1 byte per cell = owner ID)
+        # 2. Player count: 1 byte
+        # 3. Per player: ID (!B), Score (!H), Cursor_X (!i), Cursor_Y (!i), dX (!i), dY (!i) = 19 bytes each
+
+        # The grid region needs no work since grid_state is a view of the buffer
+        grid_len = self._total_cells
+        num_players = len(self.addr_to_pid)
+
+        # Pack player count and player data (ID, Score, X, Y, dX, dY → 19 bytes each, in one copy)
+        self._snapshot_buf[HEADER_SIZE + grid_len] = num_players
+        self.write_player_records(self._snapshot_players, track_deltas=True)
+        return HEADER_SIZE + grid_len + 1 + num_players * _PLAYER_DTYPE.itemsize
+
+    def write_delta(self):
+        """Fill in the delta buffer (cells changed since the keyframe, then the player records); returns the used length."""
+        buf, grid = self._delta_buf, self._snapshot_buf
+        DELTA_HEAD.pack_into(buf, HEADER_SIZE, self._keyframe_id, len(self._dirty))
+        offset = HEADER_SIZE + DELTA_HEAD.size
+        pack_cell = DELTA_CELL.pack_into
+        for index in self._dirty:
+            pack_cell(buf, offset, index, grid[HEADER_SIZE + index])
+            offset += DELTA_CELL.size
+
+        # Player count and records, laid out as in a keyframe
+        num_players = len(self.addr_to_pid)
+        buf[offset] = num_players
+        players = np.frombuffer(buf, dtype=_PLAYER_DTYPE, count=num_players, offset=offset + 1)
+        self.write_player_records(players, track_deltas=True)
+        return offset + 1 + num_players * _PLAYER_DTYPE.itemsize
+
     def state_broadcast(self):
-        if not self.clients:
+        if not self.addr_to_pid:
             return
         self.snapshot_id += 1
         current_timestamp = get_current_timestamp_ms()
-        
-        # New payload structure:
-        # 1. Grid data: 400 bytes (20x20 flat array, 1 byte per cell = owner ID)
-        # 2. Player count: 1 byte
-        # 3. Per player: ID (!B), Score (!H), Cursor_X (!i), Cursor_Y (!i) = 11 bytes each
-        
-        # Pack grid state (400 bytes)
-        payload = bytes(self.grid_state)
-        
-        # Pack player count and player data
-        num_players = len(self.clients)
-        payload += struct.pack('!B', num_players)
-        
-        for clientData in self.clients.values():
-            player_id = clientData['player_id']
-            score = self.scores.get(player_id, 0)
-            curr_pos = clientData['pos']
-            
-            # ← DELTA ENCODING
-            prev_pos = clientData.get('prev_pos', curr_pos)
-            dx = curr_pos[0] - prev_pos[0]
-            dy = curr_pos[1] - prev_pos[1]
-            clientData['prev_pos'] = curr_pos  # Save for next
-
-            # Pack: ID, Score, X, Y, dX, dY → 17 bytes
-            payload += struct.pack('!BHiiii', player_id, score, curr_pos[0], curr_pos[1], dx, dy)
-
-        # send packets to all connected clients
-        for clientAddress, clientData in self.clients.items():
-            clientData['seq_num'] += 1
-            packet = pack_packet(MessageType.SNAPSHOT, self.snapshot_id, clientData['seq_num'], current_timestamp,
-                                 payload)
-            self.socket.sendto(packet, clientAddress)
-
 
-    def send_current_state(self, client_address):
-        """Send current game state to a new client."""
-        current_timestamp = get_current_timestamp_ms()
+        # Most ticks change a cell or two, so between keyframes only the changed cells are sent
+        # (~110 bytes with 4 players instead of ~480)
+        self._ticks_since_keyframe += 1
+        if (self._keyframe_due or self._ticks_since_keyframe >= KEYFRAME_INTERVAL
+                or len(self._dirty) > DELTA_MAX_CELLS):
+            msg_type, buf, used = MessageType.SNAPSHOT, self._snapshot_buf, self.write_keyframe()
+            self._keyframe_id = self.snapshot_id
+            self._ticks_since_keyframe = 0
+            self._keyframe_due = False
+            self._dirty.clear()
+        else:
+            msg_type, buf, used = MessageType.DELTA_SNAPSHOT, self._delta_buf, self.write_delta()
 
-        # Pack grid state (400 bytes)
-        payload = bytes(self.grid_state)
+        # Patch the persistent buffer in place and send only the used prefix
+        packet_buf = memoryview(buf)[:used]
 
-        # Pack player count and player data
-        num_players = len(self.clients)
-        payload += struct.pack('!B', num_players)
+        # Header is packed once; only seq_num (and so the checksum) differs per client. packet_buf's
+        # own header is never sent, so its CRC is skipped: stamp_header_into computes each client's
+        pack_packet_into(packet_buf, msg_type, self.snapshot_id, 0, current_timestamp, checksum=False)
 
-        for clientData in self.clients.values():
-            player_id = clientData['player_id']
-            score = self.scores.get(player_id, 0)
-            curr_pos = clientData['pos']
+        # send packets to all connected clients: each gets its own header, the payload is shared
+        seq, sockaddrs, headers = self.seq, self.sockaddrs, self.sender.headers
+        targets = []
+        for player_id, clientAddress in enumerate(self.addrs):
+            if clientAddress is None:
+                continue
+            seq[player_id] += 1
+            stamp_header_into(headers[len(targets)], packet_buf, seq[player_id])
+            targets.append((sockaddrs[player_id], clientAddress))
+        self.sender.send(packet_buf[HEADER_SIZE:], targets)
 
-            # Pack: ID (1 byte), Score (2 bytes), X (4 bytes), Y (4 bytes) = 11 bytes
-            payload += struct.pack('!BHii', player_id, score, curr_pos[0], curr_pos[1])
 
-            packet = pack_packet(MessageType.SNAPSHOT, self.snapshot_id, clientData['seq_num'], current_timestamp,
-                                 payload)
-            self.socket.sendto(packet, client_address)
+    def send_current_state(self, client_address):
+        """Send current game state to a new client."""
+        current_timestamp = get_current_timestamp_ms()
 
-    def run(self):
-        # self.socket.settimeout(0.001)
+        # Same layout as state_broadcast (grid, player count, 19-byte player records) so the
+        # client decodes it like any other snapshot; deltas are zero since nothing is moving
+        grid_len = self.grid_state.size
+        num_players = len(self.addr_to_pid)
+        packet_buf = bytearray(HEADER_SIZE + grid_len + 1 + num_players * _PLAYER_DTYPE.itemsize)
 
-        last_broadcast_time = time.time()
-        last_timeout_check = time.time()
-        broadcast_interval = 1.0 / self.broadcast_frequency
+        # Pack grid state (400 bytes)
+        packet_buf[HEADER_SIZE:HEADER_SIZE + grid_len] = self.grid_state.tobytes()
 
-        # main server loop
-        while 1:
+        # Pack player count and player data
+        packet_buf[HEADER_SIZE + grid_len] = num_players
+        offset = HEADER_SIZE + grid_len + 1
+        players = np.frombuffer(packet_buf, dtype=_PLAYER_DTYPE, count=num_players, offset=offset)
+        self.write_player_records(players, track_deltas=False)
+
+        # Payload is complete before packing, so the header + CRC are computed once and sent once
+        pack_packet_into(packet_buf, MessageType.SNAPSHOT, self.snapshot_id, 0, current_timestamp)
+        self.socket.sendto(packet_buf, client_address)
+
+    def receive_packets(self):
+        """Drain every datagram currently queued on the socket and dispatch it."""
+        while True:
             try:
+                batch = self.receiver.recv()
+            except Exception as e:
+                print(f"[ERROR] Unexpected socket error: {e}")
+                return
+
+            for data, client_address in batch:
                 try:
-                    data, client_address = self.socket.recvfrom(self.max_packet_size)
                     pkt, payload = unpack_packet(data)
                     if pkt.msg_type == MessageType.CLIENT_INIT:
                         self.handle_client_hello(client_address)
@@ -323,34 +526,42 @@ class GridServer:
                         self.handle_acquire_request(client_address, payload, pkt.seq_num)
                     elif pkt.msg_type == MessageType.NEW_GAME:
                         self.handle_new_game()
-                except BlockingIOError:
-                    # Expected: no data to receive
-                    pass
-                except socket.timeout:
-                    # Expected: timeout
-                    pass
-                except ConnectionResetError:
-                    # BUG FIX: This error occurs on Windows when a client socket is forcibly closed.
-                    # For a connectionless protocol like UDP, it's safe to ignore and continue operating.
-                    pass
                 except Exception as e:
                     print(f"[ERROR] Unexpected socket error: {e}")
-                    continue
+
+            # A short batch means the queue is empty, no need for another syscall to find out
+            if len(batch) < RECV_BATCH:
+                return
+
+    def run(self):
+        # Block in the kernel until a packet arrives or the next broadcast is due,
+        # instead of polling recvfrom with a fixed 1 ms sleep.
+        # Syscalls are already batched (one recvmmsg per burst, one sendmmsg per tick); an
+        # io_uring/SQPOLL loop would only save those few calls, at the cost of a non-stdlib
+        # dependency, a kernel polling thread per server and a Linux-only code path.
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ)
+
+        broadcast_interval = 1.0 / self.broadcast_frequency
+        next_broadcast_time = time.time() + broadcast_interval
+
+        # main server loop
+        while 1:
+            try:
+                # sleep until whichever is due first: the next broadcast or the next client expiry
+                next_due = min(next_broadcast_time, self.next_expiry())
+                if selector.select(max(0.0, next_due - time.time())):
+                    self.receive_packets()
 
                 current_time = time.time()
 
                 # brodacast at the configured freq
-                if current_time - last_broadcast_time >= broadcast_interval:
+                if current_time >= next_broadcast_time:
                     self.state_broadcast()
-                    last_broadcast_time += broadcast_interval
+                    next_broadcast_time += broadcast_interval
 
-                # checking timeouts periodically (currently once every sec)
-                if current_time - last_timeout_check >= 1.0:
-                    self.handle_timeout()
-                    last_timeout_check = current_time
-
-                # somehow this prevents 100% usage of cpu based on ai response
-                time.sleep(0.001)
+                # timeouts are checked every wakeup; with nothing expired it is a heap peek
+                self.handle_timeout()
 
             except KeyboardInterrupt:
                 print("Server shutting down.")
@@ -359,19 +570,20 @@ class GridServer:
                 print(f"Error: {e}")
                 break
 
+        selector.close()
         self.socket.close()
     def reset_server(self):
         print("[SERVER] Resetting server state...")
         self.snapshot_id = 0
         self.seq_num = 0
-        self.grid_state = bytearray([UNCLAIMED_ID] * (GRID_WIDTH * GRID_HEIGHT))
-        self.grid_ts = [[0 for _ in range(GRID_HEIGHT)] for _ in range(GRID_WIDTH)]  # ← RESET TIMESTAMPS
-        self.scores = {}
+        self.grid_state.fill(UNCLAIMED_ID)
+        self._keyframe_due = True
+        for pid in range(self.max_clients):
+            self.score[pid] = 0
+        self.reset_positions()
         self.game_active = True
-        self.claimed_cells = len(self.clients)
         self.winner_id = None
         self.winner_score = 0
-        self.clients_pos = {}
 
 
     def handle_new_game(self):
@@ -379,28 +591,24 @@ class GridServer:
             print("[SERVER] Game already active, ignoring NEW_GAME request")
             return
         print("[SERVER] Processing NEW_GAME request...")
-        # Store current client addresses before reset
-        connected_clients = list(self.clients.keys())
-        # Reset server state
+        # Reset server state (connected clients keep their slots)
         self.reset_server()
 
-        for client_addr in connected_clients:
-            player_id = self.clients[client_addr]['player_id']
-            self.clients[client_addr] = {
-                'player_id': player_id,
-                'seq_num': 0,
-                'last_heartbeat': time.time(),
-                'pos': PLAYER_POSITIONS.get(player_id, PLAYER_POSITIONS['default']),
-                'processed_seqs': set()
-            }
-            self.scores[player_id] = 0
+        for player_id, client_addr in enumerate(self.addrs):
+            if client_addr is None:
+                continue
+            self.seq[player_id] = 0
+            self.touch_client(player_id)
+            self.hi_seq[player_id] = 0
+            self.seq_window[player_id] = 0
             #self.next_player_id += 1
-            pos_x, pos_y = PLAYER_POSITIONS.get(player_id, PLAYER_POSITIONS['default'])
+            pos_x, pos_y = self.pos_x[player_id], self.pos_y[player_id]
+            self.prev_x[player_id], self.prev_y[player_id] = pos_x, pos_y
             self.acquire_cell(pos_x, pos_y, player_id)
 
 
             # Send SERVER_INIT_RESPONSE with new ID
-            payload = struct.pack('!Bii', player_id, pos_x, pos_y)
+            payload = _HELLO_RESP.pack(player_id, pos_x, pos_y)
             response_packet = pack_packet(
                 MessageType.SERVER_INIT_RESPONSE,
                 0, 0,
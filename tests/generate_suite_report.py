@@ -3,9 +3,86 @@ import json
 import glob
 import sys
 import csv
+import pickle
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# orjson is optional: a faster parser for the summary files, stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Paths resolved once at import
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_RESULTS_ROOT = os.path.join(_BASE_DIR, "results")
+_AUTO_PLOTTER = os.path.join(_BASE_DIR, "plots", "auto_plotter.py")
+
+
+def load_json_file(path):
+    """Parse a JSON file with orjson when it is installed, stdlib json otherwise."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN written by json.dump, which orjson rejects; let stdlib json decide
+    return json.loads(raw)
+
+
+# Parsed all_scenarios_summary.json, shared with the auto plotter subprocess (see load_consolidated)
+SUMMARY_CACHE_NAME = ".summary.pkl"
+
+
+def load_consolidated(consolidated_file, cache_file):
+    """
+    Parse the consolidated summary JSON, through a pickle cache that is valid while the
+    file's path, mtime and size are unchanged.
+    """
+    st = os.stat(consolidated_file)
+    key = (os.path.abspath(consolidated_file), st.st_mtime_ns, st.st_size)
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_key, data = pickle.load(f)
+        if cached_key == key:
+            return data
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass  # no cache yet, or unreadable: parse the JSON
+
+    data = load_json_file(consolidated_file)
+    try:
+        # Write then rename, so a concurrent reader never sees a half-written cache
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"[WARN] Could not write summary cache: {e}")
+    return data
+
+
+def _load_summary_file(path):
+    """Return (path, parsed dict, None), or (path, None, error) if the file can't be read."""
+    try:
+        return path, load_json_file(path), None
+    except Exception as e:
+        return path, None, e
+
+
+def load_summary_files(results_root, max_workers=8):
+    """
+    Parse every summary.json under results_root, several files at a time so the reads overlap
+    (file reads release the GIL). Returns (path, data, error) tuples in discovery order.
+    """
+    # iglob lists each directory once (scandir) and yields only the matches
+    paths = list(glob.iglob(os.path.join(results_root, "**", "summary.json"), recursive=True))
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as ex:
+        return list(ex.map(_load_summary_file, paths))
+
 
 def load_summaries(results_root):
     """
@@ -16,27 +93,21 @@ def load_summaries(results_root):
     consolidated_file = os.path.join(results_root, "all_scenarios_summary.json")
     if os.path.exists(consolidated_file):
         try:
-            with open(consolidated_file, 'r') as f:
-                data = json.load(f)
-                if 'scenarios' in data and len(data['scenarios']) > 0:
-                    print(f"[+] Loaded consolidated summary: {len(data['scenarios'])} scenarios")
-                    # Convert to dict keyed by scenario name
-                    return {s['scenario']: s for s in data['scenarios']}
+            data = load_consolidated(consolidated_file, os.path.join(results_root, SUMMARY_CACHE_NAME))
+            if 'scenarios' in data and len(data['scenarios']) > 0:
+                print(f"[+] Loaded consolidated summary: {len(data['scenarios'])} scenarios")
+                # Convert to dict keyed by scenario name
+                return {s['scenario']: s for s in data['scenarios']}
         except (json.JSONDecodeError, IOError) as e:
             print(f"[WARN] Error loading consolidated summary: {e}")
     
     # Fallback: Find all individual summary.json files in subdirectories
     print("[*] Falling back to individual summary.json files...")
     summaries = []
-    for root, dirs, files in os.walk(results_root):
-        if "summary.json" in files:
-            with open(os.path.join(root, "summary.json"), 'r') as f:
-                try:
-                    data = json.load(f)
-                    data['path'] = root
-                    summaries.append(data)
-                except:
-                    pass
+    for path, data, error in load_summary_files(results_root):
+        if error is None:
+            data['path'] = os.path.dirname(path)
+            summaries.append(data)
     
     # Sort by timestamp (newest last)
     summaries.sort(key=lambda x: x.get('timestamp', 0))
@@ -52,19 +123,19 @@ def load_summaries(results_root):
 
 def run_auto_plotter():
     """Run the auto plotter to generate all graphs."""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    auto_plotter = os.path.join(base_dir, "plots", "auto_plotter.py")
+    # The summary was just parsed (and cached) by load_summaries; the plotter reuses it
+    cache_file = os.path.join(_RESULTS_ROOT, SUMMARY_CACHE_NAME)
     
-    if os.path.exists(auto_plotter):
+    if os.path.exists(_AUTO_PLOTTER):
         print("\n" + "=" * 50)
         print("[*] Running Auto Plotter to generate graphs...")
         print("=" * 50)
         try:
             result = subprocess.run(
-                [sys.executable, auto_plotter],
+                [sys.executable, _AUTO_PLOTTER, "--cache", cache_file],
                 capture_output=True,
                 text=True,
-                cwd=base_dir
+                cwd=_BASE_DIR
             )
             print(result.stdout)
             if result.returncode != 0:
@@ -72,12 +143,11 @@ def run_auto_plotter():
         except Exception as e:
             print(f"[WARN] Failed to run auto plotter: {e}")
     else:
-        print(f"[WARN] Auto plotter not found at: {auto_plotter}")
+        print(f"[WARN] Auto plotter not found at: {_AUTO_PLOTTER}")
 
 
 def main():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    results_root = os.path.join(base_dir, "results")
+    results_root = _RESULTS_ROOT
     
     # Load summaries (prefers consolidated file)
     latest_scenarios = load_summaries(results_root)
@@ -85,14 +155,16 @@ def main():
     # Order of Scenarios
     order = ["Baseline", "Loss 2%", "Loss 5%", "Delay 100ms"]
     
-    print("\n" + "="*100)
-    print(f"GRIDCLASH TEST SUITE REPORT - {datetime.now().strftime('%d/%m %H:%M')}")
-    print("="*100)
+    # The report table is collected and written to stdout in one call
+    lines = []
+    lines.append("\n" + "="*100)
+    lines.append(f"GRIDCLASH TEST SUITE REPORT - {datetime.now().strftime('%d/%m %H:%M')}")
+    lines.append("="*100)
     
     # Header
     header = f"{'Scenario':<15} | {'Lat(Avg)':<10} | {'Jit(Avg)':<10} | {'Err(Avg)':<10} | {'Err(95%)':<10} | {'CPU%':<6} | {'Status'}"
-    print(header)
-    print("-" * 100)
+    lines.append(header)
+    lines.append("-" * 100)
     
     csv_rows = []
     csv_rows.append(["Scenario", "Latency_Avg", "Jitter_Avg", "Error_Avg", "Error_95", "CPU_Percent", "Status"])
@@ -121,18 +193,19 @@ def main():
             status = "PASS" if passed else "FAIL"
 
             line = f"{name:<15} | {lat:<10.2f} | {jit:<10.2f} | {err_avg:<10.4f} | {err_95:<10.4f} | {cpu:<6.1f} | {status}"
-            print(line)
+            lines.append(line)
             
             csv_rows.append([name, lat, jit, err_avg, err_95, cpu, status])
         else:
-            print(f"{name:<15} | {'N/A':<10} | {'N/A':<10} | {'N/A':<10} | {'N/A':<10} | {'N/A':<6} | N/A")
+            lines.append(f"{name:<15} | {'N/A':<10} | {'N/A':<10} | {'N/A':<10} | {'N/A':<10} | {'N/A':<6} | N/A")
 
-    print("-" * 100)
-    print(f"Total scenarios: {scenarios_found}/{len(order)}")
+    lines.append("-" * 100)
+    lines.append(f"Total scenarios: {scenarios_found}/{len(order)}")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Save to file
     summary_file = os.path.join(results_root, "suite_report_latest.csv")
-    with open(summary_file, 'w', newline='') as f:
+    with open(summary_file, 'w', newline='', buffering=1 << 16) as f:
         writer = csv.writer(f)
         writer.writerows(csv_rows)
     print(f"\nSaved suite report to: {summary_file}")
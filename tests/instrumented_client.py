@@ -1,8 +1,9 @@
-import csv
 import sys
 import os
 import time
 import random
+import selectors
+import signal
 import threading
 import struct
 from collections import deque
@@ -13,8 +14,10 @@ project_root = os.path.abspath(os.path.join(current_dir, '..'))
 sys.path.insert(0, project_root)
 
 from src.client_headless import GridClient, MessageType, unpack_packet
-from src.protocol import get_current_timestamp_ms, UNCLAIMED_ID
-from src.constants import GRID_WIDTH, GRID_HEIGHT
+from src.protocol import get_current_timestamp_ms
+
+# Write buffer for each log file, large enough that rows reach the OS only when flush_logs runs
+LOG_BUFFER_SIZE = 1 << 20
 
 class InstrumentedClient(GridClient):
     def __init__(self, client_id, server_address, log_dir, seed, action_interval_range):
@@ -25,24 +28,30 @@ class InstrumentedClient(GridClient):
         
         # Logging
         os.makedirs(log_dir, exist_ok=True)
-        self.metrics_file = open(os.path.join(log_dir, f'client_{client_id}_metrics.csv'), 'w', newline='')
-        self.metrics_writer = csv.writer(self.metrics_file)
-        self.metrics_writer.writerow([
-            'client_id', 'snapshot_id', 'seq_num', 
-            'server_timestamp_ms', 'recv_time_ms', 
-            'latency_ms', 'jitter_ms', 'perceived_position_error', 
-            'cpu_percent', 'bandwidth_per_client_kbps'
-        ])
+        # Rows are buffered and written in batches (see flush_logs); the file buffers are sized so
+        # only those explicit flushes reach the OS
+        self.metrics_file = open(os.path.join(log_dir, f'client_{client_id}_metrics.csv'), 'w', newline='',
+                                 buffering=LOG_BUFFER_SIZE)
+        # The schema is fixed and all-numeric, so rows are formatted directly instead of going through csv.writer
+        self.metrics_file.write(
+            'client_id,snapshot_id,seq_num,'
+            'server_timestamp_ms,recv_time_ms,'
+            'latency_ms,jitter_ms,perceived_position_error,'
+            'cpu_percent,bandwidth_per_client_kbps\n'
+        )
         
-        self.pos_file = open(os.path.join(log_dir, f'client_{client_id}_positions.csv'), 'w', newline='')
-        self.pos_writer = csv.writer(self.pos_file)
+        self.pos_file = open(os.path.join(log_dir, f'client_{client_id}_positions.csv'), 'w', newline='',
+                             buffering=LOG_BUFFER_SIZE)
         # broadcast_timestamp_ms is the unified timestamp from server broadcasts
         # This matches the server's position log for exact-match error calculation
-        self.pos_writer.writerow(['broadcast_timestamp_ms', 'client_id', 'x', 'y'])
+        self.pos_file.write('broadcast_timestamp_ms,client_id,x,y\n')
+        self._pos_buf = []
+        self._metrics_buf = []
+        self._last_flush = time.time()
         
         self.last_recv_ts = 0
         self.last_server_ts = 0
-        self.jitter = 0.0
+        self.jitter_x16 = 0  # interarrival jitter in ms, fixed point scaled by 16 (RFC 3550 A.8)
         
         self.start_time = time.time()
         self.bytes_received = 0
@@ -78,142 +87,96 @@ class InstrumentedClient(GridClient):
         # Call super to process state (updates self.grid_state, self.target_players, etc)
         super().handle_game_state_update(data)
         
-        try:
-            pkt, payload = unpack_packet(data)
-            if pkt.msg_type != MessageType.SNAPSHOT:
-                return
+        # Header as already parsed by super(), whose guarded unpack leaves it None for a malformed
+        # packet, so nothing below can raise and no handler is needed here
+        pkt = self.last_pkt
+        if pkt is None or (pkt.msg_type != MessageType.SNAPSHOT and pkt.msg_type != MessageType.DELTA_SNAPSHOT):
+            return
 
-            # server_ts is the broadcast timestamp - the unified sync key
-            server_ts = pkt.server_timestamp
-            latency = recv_ts - server_ts
-            
-            # Jitter calculation
-            if self.last_recv_ts > 0:
-                delta_recv = recv_ts - self.last_recv_ts
-                delta_server = server_ts - self.last_server_ts
-                inst_jitter = abs(delta_recv - delta_server)
-                self.jitter = 0.875 * self.jitter + 0.125 * inst_jitter
-            
-            self.last_recv_ts = recv_ts
-            self.last_server_ts = server_ts
-            
-            # SYNCHRONIZED POSITION LOGGING (20Hz, same rate as server broadcasts)
-            # Use server_ts (broadcast timestamp) as the unified timestamp
-            # This enables exact-match position error calculation with server logs
-            self.pos_writer.writerow([server_ts, self.client_id, client_pos_x, client_pos_y])
-            self.pos_file.flush()
-            
-            # We log the packet size in the 'bandwidth' column (to be aggregated later)
-            self.metrics_writer.writerow([
-                self.client_id, pkt.snapshot_id, pkt.seq_num,
-                server_ts, recv_ts,
-                latency, self.jitter,
-                0, # error calc later
-                0, # cpu calc later
-                len(data)
-            ])
-            self.metrics_file.flush()
-            
-        except Exception:
-            pass
-
-    def bfs_find_nearest_unclaimed(self):
-        """
-        Uses BFS to find the shortest path to an unclaimed cell.
-        Returns a deque of (dx, dy) moves relative to current position.
-        """
-        start_x, start_y = self.pos_x, self.pos_y
-        
-        # Directions: Up, Down, Left, Right
-        # Note: Grid coordinates are usually (row, col) = (y, x). 
-        # API expects request(row, col) => request(y, x).
-        # Directions as (dx, dy)
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0)] # Up, Down, Left, Right 
-        
-        queue = deque([(start_x, start_y)])
-        visited = set([(start_x, start_y)])
-        
-        # Parent map to reconstruct path: (child_x, child_y) -> (parent_x, parent_y, direction)
-        parent_map = {} 
+        # server_ts is the broadcast timestamp - the unified sync key
+        server_ts = pkt.server_timestamp
+        latency = recv_ts - server_ts
         
-        found_target = None
+        # Jitter calculation (RFC 3550 interarrival jitter: J += (|D| - J) / 16), in integer
+        # fixed point like the RFC's reference code (A.8), kept in a local and stored once
+        jitter_x16 = self.jitter_x16
+        if self.last_recv_ts > 0:
+            delta_recv = recv_ts - self.last_recv_ts
+            delta_server = server_ts - self.last_server_ts
+            jitter_x16 += abs(delta_recv - delta_server) - ((jitter_x16 + 8) >> 4)
+            self.jitter_x16 = jitter_x16
         
-        while queue:
-            curr_x, curr_y = queue.popleft()
-            
-            # Check if this cell is a valid target (Unclaimed)
-            idx = curr_y * GRID_WIDTH + curr_x
-            if self.grid_state[idx] == UNCLAIMED_ID:
-                found_target = (curr_x, curr_y)
-                break
-            
-            for dx, dy in directions:
-                nx, ny = curr_x + dx, curr_y + dy
-                
-                # Check bounds
-                if not (0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT):
-                    continue
-                
-                if (nx, ny) in visited:
-                    continue
-                
-                # Check passability: Can we move through this cell?
-                # User rule: "treat already-claimed cells as passable" 
-                # But physically we can only move through our own cells or unclaimed cells.
-                # If we try to move into another player's cell, the server (and client check) will reject it.
-                # So we must treat OTHER PLAYERS' cells as obstacles.
-                n_idx = ny * GRID_WIDTH + nx
-                owner = self.grid_state[n_idx]
-                
-                # Passable if Untaken OR Owned by Me
-                if owner == UNCLAIMED_ID or owner == self.client_id:
-                    visited.add((nx, ny))
-                    parent_map[(nx, ny)] = (curr_x, curr_y, (dx, dy))
-                    queue.append((nx, ny))
+        self.last_recv_ts = recv_ts
+        self.last_server_ts = server_ts
         
-        if found_target:
-            # Reconstruct path
-            path = deque()
-            curr = found_target
-            while curr != (start_x, start_y):
-                prev_x, prev_y, move = parent_map[curr]
-                path.appendleft(move)
-                curr = (prev_x, prev_y)
-            return path
+        # SYNCHRONIZED POSITION LOGGING (20Hz, same rate as server broadcasts)
+        # Use server_ts (broadcast timestamp) as the unified timestamp
+        # This enables exact-match position error calculation with server logs
+        self._pos_buf.append(f"{server_ts},{self.client_id},{client_pos_x},{client_pos_y}\n")
         
-        return None
+        # We log the packet size in the 'bandwidth' column (to be aggregated later);
+        # error and cpu are calculated later
+        self._metrics_buf.append(
+            f"{self.client_id},{pkt.snapshot_id},{pkt.seq_num},"
+            f"{server_ts},{recv_ts},"
+            f"{latency},{jitter_x16 / 16},"
+            f"0,0,{len(data)}\n"
+        )
+        if len(self._pos_buf) >= 100 or time.time() - self._last_flush > 1.0:
+            self.flush_logs()
+
+    def flush_logs(self):
+        """Write the buffered position/metrics rows and flush both files."""
+        self.pos_file.write(''.join(self._pos_buf))
+        self._pos_buf.clear()
+        self.metrics_file.write(''.join(self._metrics_buf))
+        self._metrics_buf.clear()
+        self.pos_file.flush()
+        self.metrics_file.flush()
+        self._last_flush = time.time()
 
     def run_automated(self):
         # Headless setup
         self.send_hello()
         self.socket.setblocking(False)
         
-        last_action_time = time.time()
         # Initial wait
         time.sleep(0.5)
         
         # print(f"[INSTRUMENTED CLIENT {self.client_id}] Started.")
+
+        # The loop sleeps in the selector until a packet arrives or the next move/heartbeat is
+        # due, instead of waking every 1 ms to poll the socket
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ)
+        readable = True  # drain whatever queued up during the initial wait
+        # Deadlines on the monotonic clock, each computed once when its event fires. The move delay
+        # (50-100ms) comes from the seeded self.rng, so a seed reproduces a bot's pacing.
+        now = time.monotonic()
+        next_action_at = now + self.rng.uniform(0.05, 0.1)
+        next_heartbeat_at = now + self.heartbeat_interval
         
         running = True
         try:
             while running:
-                now = time.time()
+                now = time.monotonic()
                 
                 # Heartbeat
-                if (now - self.last_heartbeat_time) >= self.heartbeat_interval:
+                if now >= next_heartbeat_at:
                     self.send_heartbeat()
-                    self.last_heartbeat_time = now
+                    next_heartbeat_at = now + self.heartbeat_interval
                 
-                # Network Recv
+                # Network Recv (only when the selector reported the socket readable)
                 state_updated = False
+                moved = False
                 try:
-                    while True:
+                    while readable:
                         data, addr = self.socket.recvfrom(65535) 
                         if addr == self.server_address:
                             pkt, payload = unpack_packet(data)
                             if pkt.msg_type == MessageType.SERVER_INIT_RESPONSE:
                                 self.handle_server_hello(data)
-                            elif pkt.msg_type == MessageType.SNAPSHOT:
+                            elif pkt.msg_type == MessageType.SNAPSHOT or pkt.msg_type == MessageType.DELTA_SNAPSHOT:
                                 self.handle_game_state_update(data)
                                 state_updated = True
                             elif pkt.msg_type == MessageType.GAME_OVER:
@@ -243,7 +206,7 @@ class InstrumentedClient(GridClient):
                     # Usually SERVER_INIT_RESPONSE if we sent NEW_GAME and re-registered?
                     # Or maybe just grid clears?
                     # Client handle_server_hello resets game state.
-                    time.sleep(0.1)
+                    readable = selector.select(0.1)
                     continue
 
                 if self.waiting_restart and self.initialized:
@@ -268,7 +231,7 @@ class InstrumentedClient(GridClient):
                     # Rate limiting: 50-100ms
                     # Use self.action_min / action_max (which was 50-200 in main)
                     # Let's use a tighter constraint as requested: 50-100ms
-                    if now - last_action_time >= (random.uniform(0.05, 0.1)):
+                    if now >= next_action_at:
                         if self.target_path:
                             dx, dy = self.target_path.popleft()
                             
@@ -280,7 +243,8 @@ class InstrumentedClient(GridClient):
                             
                             # Send move
                             self.send_acquire_request(target_y, target_x)
-                            last_action_time = now
+                            next_action_at = now + self.rng.uniform(0.05, 0.1)
+                            moved = True
                             
                             # Note: self.pos_x/y updates immediately in send_acquire_request (Optimistic)
                             # If NACKed, it resets.
@@ -295,11 +259,19 @@ class InstrumentedClient(GridClient):
                 # Position logging is now handled in handle_game_state_update()
                 # at 20Hz synchronized with server broadcasts using server_timestamp
                 
-                time.sleep(0.001)
+                # Sleep until a packet arrives, the next heartbeat is due or, with a path to
+                # follow (or one to plan after this move), the next move is due; if the BFS found
+                # no path, only a new snapshot can give one
+                wake_at = next_heartbeat_at
+                if self.initialized and (self.target_path or moved):
+                    wake_at = min(wake_at, next_action_at)
+                readable = selector.select(max(0.0, wake_at - time.monotonic()))
 
         except KeyboardInterrupt:
             pass
         finally:
+            selector.close()
+            self.flush_logs()
             self.metrics_file.close()
             self.pos_file.close()
 
@@ -317,6 +289,10 @@ if __name__ == "__main__":
     if exit_args.id != 255:
         rng_seed += exit_args.id
         
+    # The test runner stops clients with terminate(); exit through the finally block so
+    # buffered log rows are written out
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
     c = InstrumentedClient(exit_args.id, (exit_args.host, 12000), exit_args.log_dir, rng_seed, (50, 200))
     c.headless_mode = True 
     c.run_automated()
@@ -1,6 +1,8 @@
-import csv
 import os
+import queue
+import signal
 import sys
+import threading
 import time
 
 # Add src to path
@@ -11,6 +13,9 @@ sys.path.insert(0, project_root)
 from src.server import GridServer
 from src.protocol import get_current_timestamp_ms
 
+# Write buffer for the position log, large enough that rows reach the OS only on the writer thread's periodic flush
+LOG_BUFFER_SIZE = 1 << 20
+
 class InstrumentedServer(GridServer):
     def __init__(self, port, grid_size, log_dir):
         super().__init__(port, grid_size)
@@ -21,10 +26,17 @@ class InstrumentedServer(GridServer):
         
         # Server Position Log - uses broadcast_timestamp as the sync key
         self.pos_log_path = os.path.join(log_dir, 'server_positions.csv')
-        self.pos_log_file = open(self.pos_log_path, 'w', newline='')
-        self.pos_writer = csv.writer(self.pos_log_file)
+        # Binary mode: rows are formatted straight to bytes, with no text encoding layer
+        self.pos_log_file = open(self.pos_log_path, 'wb', buffering=LOG_BUFFER_SIZE)
         # broadcast_timestamp is the unified timestamp for both server and client logging
-        self.pos_writer.writerow(['broadcast_timestamp_ms', 'client_id', 'x', 'y'])
+        self.pos_log_file.write(b'broadcast_timestamp_ms,client_id,x,y\n')
+
+        # Rows are formatted and written by a writer thread, so the broadcast tick (whose timing
+        # the latency/jitter metrics measure) only enqueues one item and never touches the file.
+        # Each item is (broadcast_ts, [(pid, x, y), ...]); None stops the thread.
+        self._log_q = queue.Queue()
+        self._log_thread = threading.Thread(target=self._drain_log, daemon=True)
+        self._log_thread.start()
         
         # CPU Log (if we want self-reporting, but psutil external monitor is better)
         
@@ -40,23 +52,52 @@ class InstrumentedServer(GridServer):
         # as the unified sampling timestamp for both server and client logs
         broadcast_ts = get_current_timestamp_ms()
         
-        # Log server's authoritative positions with the broadcast timestamp
-        for client_addr, client_data in self.clients.items():
-            pid = client_data['player_id']
-            # pos is (x, y) = (col, row)
-            pos = client_data.get('pos', (0,0))
-            self.pos_writer.writerow([broadcast_ts, pid, pos[0], pos[1]])
-        
-        self.pos_log_file.flush()
+        # Log server's authoritative positions with the broadcast timestamp (written by _drain_log)
+        # pos is (x, y) = (col, row)
+        pos_x, pos_y = self.pos_x, self.pos_y
+        self._log_q.put_nowait((broadcast_ts, [(pid, pos_x[pid], pos_y[pid])
+                                               for pid, client_addr in enumerate(self.addrs)
+                                               if client_addr is not None]))
         
         # Call parent's state_broadcast which will use the same timestamp
         # (it calls get_current_timestamp_ms internally, which will be very close)
         super().state_broadcast()
 
+    def _drain_log(self):
+        """Writer thread: format queued position rows directly as bytes (fixed numeric schema, no csv.writer), flushing every ~500 ms."""
+        log_q, log_file = self._log_q, self.pos_log_file
+        next_flush = time.monotonic() + 0.5
+        running = True
+        while running:
+            items = []
+            try:
+                items.append(log_q.get(timeout=0.5))
+                # take whatever else is already queued in the same pass
+                while len(items) < 256:
+                    items.append(log_q.get_nowait())
+            except queue.Empty:
+                pass
+            if None in items:
+                items = items[:items.index(None)]
+                running = False
+            if items:
+                buf = bytearray()
+                for ts, rows in items:
+                    for pid, x, y in rows:
+                        buf += b'%d,%d,%d,%d\n' % (ts, pid, x, y)
+                log_file.write(buf)
+            now = time.monotonic()
+            if now >= next_flush or not running:
+                log_file.flush()
+                next_flush = now + 0.5
+
     def run(self):
         try:
             super().run()
         finally:
+            # Let the writer thread drain the queue before the file is closed
+            self._log_q.put(None)
+            self._log_thread.join()
             self.pos_log_file.close()
 
 if __name__ == "__main__":
@@ -66,5 +107,9 @@ if __name__ == "__main__":
     parser.add_argument("--log-dir", type=str, required=True)
     args = parser.parse_args()
     
+    # The test runner stops the server with terminate(); exit through run()'s finally block so
+    # queued log rows are written out
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
     server = InstrumentedServer(args.port, 20, args.log_dir)
     server.run()
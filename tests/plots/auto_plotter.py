@@ -4,14 +4,32 @@ Auto Plotter - Generates all plots from plotter.py and plotter2.py
 Saves output to a timestamped folder in the plots directory.
 """
 
+import argparse
+import importlib.util
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 import sys
-import json
 from pathlib import Path
 from datetime import datetime
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
+
+# Summary parsing (orjson when installed, pickle cache) is shared with generate_suite_report
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from generate_suite_report import load_consolidated, load_json_file, load_summary_files
+
+# PNG encoder settings for every savefig: zlib level 3 instead of Pillow's default 6, which
+# encodes faster at 300 dpi for somewhat larger files
+PNG_PIL_KWARGS = {'compress_level': 3, 'optimize': False}
+
+# Shared scenario palette and bar / bar-label styling for the comparison and per-scenario plots
+_COLORS = ('#2ecc71', '#3498db', '#f39c12', '#e74c3c', '#9b59b6')
+_BAR_KW = {'alpha': 0.7, 'edgecolor': 'black'}
+_LABEL_KW = {'padding': 3, 'fontweight': 'bold'}
+_SMALL_LABEL_KW = {**_LABEL_KW, 'fontsize': 8}
 
 
 def get_timestamp_folder_name():
@@ -30,30 +48,30 @@ def create_output_dir():
     return output_dir
 
 
-def load_summary_data():
-    """Load all summary.json files from results directory"""
+def load_summary_data(cache_file=None):
+    """
+    Load all summary.json files from results directory.
+    With cache_file, the consolidated summary is read through generate_suite_report's pickle cache.
+    """
     base_dir = Path(__file__).parent.parent
     results_root = base_dir / "results"
     
     # Try to load consolidated summary first
     consolidated_file = results_root / "all_scenarios_summary.json"
     if consolidated_file.exists():
-        with open(consolidated_file, 'r') as f:
-            data = json.load(f)
-            if 'scenarios' in data and len(data['scenarios']) > 0:
-                print(f"[+] Loaded consolidated summary with {len(data['scenarios'])} scenarios")
-                return data['scenarios']
+        st = consolidated_file.stat()
+        data = _read_consolidated(str(consolidated_file), st.st_mtime_ns, st.st_size, cache_file)
+        if 'scenarios' in data and len(data['scenarios']) > 0:
+            print(f"[+] Loaded consolidated summary with {len(data['scenarios'])} scenarios")
+            return data['scenarios']
     
     # Fallback: Load individual summary.json files
     summaries = []
-    for root, dirs, files in os.walk(results_root):
-        if "summary.json" in files:
-            with open(os.path.join(root, "summary.json"), 'r') as f:
-                try:
-                    data = json.load(f)
-                    summaries.append(data)
-                except Exception as e:
-                    print(f"[WARN] Error loading {root}/summary.json: {e}")
+    for path, data, error in load_summary_files(results_root):
+        if error is None:
+            summaries.append(data)
+        else:
+            print(f"[WARN] Error loading {path}: {error}")
     
     # Sort by timestamp (newest last) and get latest for each scenario
     summaries.sort(key=lambda x: x.get('timestamp', 0))
@@ -66,6 +84,35 @@ def load_summary_data():
     return list(latest_scenarios.values())
 
 
+@lru_cache(maxsize=4)
+def _read_consolidated(path, mtime_ns, size, cache_file):
+    """
+    Parsed consolidated summary, memoized per (path, mtime, size) so repeat loads in one process
+    are free; the result is shared, so callers must not modify it.
+    """
+    if cache_file:
+        return load_consolidated(path, cache_file)
+    return load_json_file(path)
+
+
+@lru_cache(maxsize=4)
+def _read_csv(path, mtime_ns, size):
+    import pandas as pd  # only the suite report CSV needs pandas
+    # pyarrow is optional: its (multithreaded) CSV reader when installed, pandas' C parser otherwise
+    if importlib.util.find_spec("pyarrow") is not None:
+        return pd.read_csv(path, engine='pyarrow', dtype_backend='pyarrow')
+    return pd.read_csv(path)
+
+
+def read_suite_csv(csv_file):
+    """
+    Read a suite report CSV into a DataFrame, memoized per (path, mtime, size); the DataFrame is
+    shared between calls, so treat it as read-only.
+    """
+    st = os.stat(csv_file)
+    return _read_csv(os.path.abspath(csv_file), st.st_mtime_ns, st.st_size)
+
+
 def load_csv_data():
     """Load suite_report_latest.csv if exists"""
     base_dir = Path(__file__).parent.parent
@@ -73,7 +120,7 @@ def load_csv_data():
     
     if csv_file.exists():
         try:
-            df = pd.read_csv(csv_file)
+            df = read_suite_csv(csv_file)
             print(f"[+] Loaded CSV with {len(df)} scenarios")
             return df
         except Exception as e:
@@ -90,19 +137,60 @@ def plot_suite_report(df, output_dir):
     if df is None or len(df) == 0:
         print("[WARN] No CSV data available for suite report plots")
         return
-    
+
+    fig = draw_suite_report(df)
+    output_file = output_dir / "suite_report_analysis.png"
+    fig.savefig(output_file, dpi=300, bbox_inches='tight', pil_kwargs=PNG_PIL_KWARGS)
+    print(f"[+] Saved: {output_file}")
+    plt.close(fig)
+
+
+# Most scenarios drawn in the suite report; beyond this the bars and labels are unreadable anyway
+MAX_SUITE_BARS = 30
+
+
+def _cap_suite_rows(df, limit=MAX_SUITE_BARS):
+    """
+    Keep the suite report to at most limit bars per group: the limit - 1 scenarios with the highest
+    average latency, then one "Others (n)" row holding the mean of the remaining scenarios' metrics.
+    """
+    if len(df) <= limit:
+        return df
+    import pandas as pd
+    top = df.nlargest(limit - 1, 'Latency_Avg')
+    rest = df.drop(top.index)
+    others = rest.mean(numeric_only=True).to_frame().T.assign(Scenario=f'Others ({len(rest)})')
+    print(f"[*] {len(df)} scenarios in the suite report; plotting the top {limit - 1} by latency "
+          f"plus the mean of the rest")
+    return pd.concat([top, others], ignore_index=True)
+
+
+def draw_suite_report(df, title='Test Suite Summary Analysis'):
+    """
+    Draw the latency/jitter, error and CPU bar charts for a suite report DataFrame; returns the figure.
+    More than MAX_SUITE_BARS scenarios are reduced first (see _cap_suite_rows).
+    """
+    df = _cap_suite_rows(df)
+
     # Set up the figure with 3 subplots (rows)
     fig, ax = plt.subplots(3, 1, figsize=(10, 15))
-    fig.suptitle('Test Suite Summary Analysis', fontsize=16)
+    fig.suptitle(title, fontsize=16)
     
+    # Columns as plain NumPy arrays, pulled out once (no Series construction/alignment per use)
+    scenarios = df['Scenario'].tolist()  # tick labels, in row order
+    lat = df['Latency_Avg'].to_numpy(dtype=np.float64)
+    jit = df['Jitter_Avg'].to_numpy(dtype=np.float64)
+    err_avg = df['Error_Avg'].to_numpy(dtype=np.float64)
+    err_95 = df['Error_95'].to_numpy(dtype=np.float64)
+    cpu = df['CPU_Percent'].to_numpy(dtype=np.float64)
+
     # X-axis positions
-    scenarios = df['Scenario']
     x = np.arange(len(scenarios))
     width = 0.35
 
     # --- Plot 1: Latency vs Jitter ---
-    rects1 = ax[0].bar(x - width/2, df['Latency_Avg'], width, label='Avg Latency (ms)', color='royalblue')
-    rects2 = ax[0].bar(x + width/2, df['Jitter_Avg'], width, label='Avg Jitter (ms)', color='orange')
+    rects1 = ax[0].bar(x - width/2, lat, width, label='Avg Latency (ms)', color='royalblue')
+    rects2 = ax[0].bar(x + width/2, jit, width, label='Avg Jitter (ms)', color='orange')
     
     ax[0].set_ylabel('Time (ms)')
     ax[0].set_title('Network Performance (Lower is Better)')
@@ -110,12 +198,12 @@ def plot_suite_report(df, output_dir):
     ax[0].set_xticklabels(scenarios)
     ax[0].legend()
     ax[0].grid(axis='y', linestyle='--', alpha=0.7)
-    ax[0].bar_label(rects1, padding=3, fmt='%.1f')
-    ax[0].bar_label(rects2, padding=3, fmt='%.1f')
+    ax[0].bar_label(rects1, labels=[f'{v:.1f}' for v in lat], padding=3)
+    ax[0].bar_label(rects2, labels=[f'{v:.1f}' for v in jit], padding=3)
 
     # --- Plot 2: Error Rates ---
-    rects3 = ax[1].bar(x - width/2, df['Error_Avg'], width, label='Error Avg', color='crimson')
-    rects4 = ax[1].bar(x + width/2, df['Error_95'], width, label='Error 95th %', color='salmon')
+    rects3 = ax[1].bar(x - width/2, err_avg, width, label='Error Avg', color='crimson')
+    rects4 = ax[1].bar(x + width/2, err_95, width, label='Error 95th %', color='salmon')
 
     ax[1].set_ylabel('Error Metric')
     ax[1].set_title('Error Rates (Lower is Better)')
@@ -123,11 +211,11 @@ def plot_suite_report(df, output_dir):
     ax[1].set_xticklabels(scenarios)
     ax[1].legend()
     ax[1].grid(axis='y', linestyle='--', alpha=0.7)
-    ax[1].bar_label(rects3, padding=3, fmt='%.2f')
-    ax[1].bar_label(rects4, padding=3, fmt='%.2f')
+    ax[1].bar_label(rects3, labels=[f'{v:.2f}' for v in err_avg], padding=3)
+    ax[1].bar_label(rects4, labels=[f'{v:.2f}' for v in err_95], padding=3)
 
     # --- Plot 3: CPU Usage ---
-    rects5 = ax[2].bar(x, df['CPU_Percent'], width*1.5, label='CPU Usage %', color='green')
+    rects5 = ax[2].bar(x, cpu, width*1.5, label='CPU Usage %', color='green')
 
     ax[2].set_ylabel('CPU Percent')
     ax[2].set_title('System Resource Usage')
@@ -135,167 +223,146 @@ def plot_suite_report(df, output_dir):
     ax[2].set_xticklabels(scenarios)
     ax[2].legend()
     ax[2].grid(axis='y', linestyle='--', alpha=0.7)
-    ax[2].bar_label(rects5, padding=3, fmt='%.1f%%')
+    ax[2].bar_label(rects5, labels=[f'{v:.1f}%' for v in cpu], padding=3)
 
-    plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-    
-    output_file = output_dir / "suite_report_analysis.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    print(f"[+] Saved: {output_file}")
-    plt.close()
+    fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+    return fig
 
 
 # ==============================================================================
 # Plots from plotter2.py - Scenario Comparison and Individual Analysis
 # ==============================================================================
 
+# One record per scenario with every scalar the comparison plots use (structure of arrays:
+# arr['cpu'] is a contiguous column), filled in a single pass over the summaries
+_METRIC_DTYPE = np.dtype([
+    ('updates', 'f8'), ('bw', 'f8'), ('cpu', 'f8'),
+    ('lat_mean', 'f8'), ('lat_med', 'f8'), ('lat_p95', 'f8'),
+    ('jit_mean', 'f8'), ('jit_med', 'f8'), ('jit_p95', 'f8'),
+    ('err_mean', 'f8'), ('err_med', 'f8'), ('err_p95', 'f8'),
+])
+
+
+def _metric_row(s):
+    m = s['metrics']
+    lat, jit, err = m['latency'], m['jitter'], m['position_error']
+    return (m['updates_per_sec'], m['bandwidth_kbps'], m['cpu_percent'],
+            lat['mean'], lat['median'], lat['p95'],
+            jit['mean'], jit['median'], jit['p95'],
+            err['mean'], err['median'], err['p95'])
+
+
 def create_comparison_plots(scenarios, output_dir):
     """Create comprehensive comparison plots across all scenarios (from plotter2.py)"""
     if not scenarios or len(scenarios) == 0:
         print("[WARN] No scenario data available for comparison plots")
         return
+    if len(scenarios) == 1:
+        # Nothing to compare; the per-scenario detailed plot (drawn by main) already covers it
+        print("[*] Only one scenario, skipping comparison plots")
+        return
     
     scenario_names = [s['scenario'] for s in scenarios]
-    colors = ['#2ecc71', '#3498db', '#f39c12', '#e74c3c', '#9b59b6'][:len(scenarios)]
+    colors = list(_COLORS[:len(scenarios)])
+    arr = np.fromiter(map(_metric_row, scenarios), dtype=_METRIC_DTYPE, count=len(scenarios))
 
     fig = plt.figure(figsize=(16, 12))
 
     # 1. Updates Per Second Comparison
-    ax1 = plt.subplot(3, 3, 1)
-    updates = [s['metrics']['updates_per_sec'] for s in scenarios]
-    bars = ax1.bar(scenario_names, updates, color=colors, alpha=0.7, edgecolor='black')
+    ax1 = fig.add_subplot(3, 3, 1)
+    updates = arr['updates']
+    bars = ax1.bar(scenario_names, updates, color=colors, **_BAR_KW)
     ax1.axhline(y=20, color='red', linestyle='--', linewidth=2, label='Target (20 ups)')
     ax1.set_ylabel('Updates/Sec', fontweight='bold')
     ax1.set_title('Update Rate Performance', fontweight='bold', fontsize=12)
     ax1.legend()
     ax1.grid(axis='y', alpha=0.3)
     ax1.tick_params(axis='x', rotation=45)
-    for bar, val in zip(bars, updates):
-        ax1.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.5,
-                 f'{val:.2f}', ha='center', va='bottom', fontweight='bold', fontsize=8)
+    ax1.bar_label(bars, labels=[f'{val:.2f}' for val in updates], **_SMALL_LABEL_KW)
 
     # 2. Bandwidth Consumption
-    ax2 = plt.subplot(3, 3, 2)
-    bandwidth = [s['metrics']['bandwidth_kbps'] for s in scenarios]
-    bars = ax2.bar(scenario_names, bandwidth, color=colors, alpha=0.7, edgecolor='black')
+    ax2 = fig.add_subplot(3, 3, 2)
+    bandwidth = arr['bw']
+    bars = ax2.bar(scenario_names, bandwidth, color=colors, **_BAR_KW)
     ax2.set_ylabel('Bandwidth (kbps)', fontweight='bold')
     ax2.set_title('Network Bandwidth Usage', fontweight='bold', fontsize=12)
     ax2.grid(axis='y', alpha=0.3)
     ax2.tick_params(axis='x', rotation=45)
-    for bar, val in zip(bars, bandwidth):
-        ax2.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 2,
-                 f'{val:.2f}', ha='center', va='bottom', fontweight='bold', fontsize=8)
+    ax2.bar_label(bars, labels=[f'{val:.2f}' for val in bandwidth], **_SMALL_LABEL_KW)
 
     # 3. CPU Utilization
-    ax3 = plt.subplot(3, 3, 3)
-    cpu = [s['metrics']['cpu_percent'] for s in scenarios]
-    bars = ax3.bar(scenario_names, cpu, color=colors, alpha=0.7, edgecolor='black')
+    ax3 = fig.add_subplot(3, 3, 3)
+    cpu = arr['cpu']
+    bars = ax3.bar(scenario_names, cpu, color=colors, **_BAR_KW)
     ax3.axhline(y=60, color='red', linestyle='--', linewidth=2, label='Limit (60%)')
     ax3.set_ylabel('CPU Usage (%)', fontweight='bold')
     ax3.set_title('Server CPU Utilization', fontweight='bold', fontsize=12)
     ax3.legend()
     ax3.grid(axis='y', alpha=0.3)
     ax3.tick_params(axis='x', rotation=45)
-    for bar, val in zip(bars, cpu):
-        ax3.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
-                 f'{val:.2f}%', ha='center', va='bottom', fontweight='bold', fontsize=8)
+    ax3.bar_label(bars, labels=[f'{val:.2f}%' for val in cpu], **_SMALL_LABEL_KW)
 
-    # 4. Latency Distribution
-    ax4 = plt.subplot(3, 3, 4)
+    # 4-6. Latency / Jitter / Position Error distributions: Mean, Median and 95th %ile bars per
+    # scenario from the matching arr columns, with one set of bar offsets for all three subplots
     x = np.arange(len(scenario_names))
     width = 0.25
-
-    mean_latency = [s['metrics']['latency']['mean'] for s in scenarios]
-    median_latency = [s['metrics']['latency']['median'] for s in scenarios]
-    p95_latency = [s['metrics']['latency']['p95'] for s in scenarios]
-
-    ax4.bar(x - width, mean_latency, width, label='Mean', color='#3498db', alpha=0.8)
-    ax4.bar(x, median_latency, width, label='Median', color='#9b59b6', alpha=0.8)
-    ax4.bar(x + width, p95_latency, width, label='95th %ile', color='#e67e22', alpha=0.8)
-
-    ax4.set_ylabel('Latency (ms)', fontweight='bold')
-    ax4.set_title('Latency Distribution', fontweight='bold', fontsize=12)
-    ax4.set_xticks(x)
-    ax4.set_xticklabels(scenario_names, rotation=45, ha='right')
-    ax4.legend()
-    ax4.grid(axis='y', alpha=0.3)
-
-    # 5. Jitter Distribution
-    ax5 = plt.subplot(3, 3, 5)
-    mean_jitter = [s['metrics']['jitter']['mean'] for s in scenarios]
-    median_jitter = [s['metrics']['jitter']['median'] for s in scenarios]
-    p95_jitter = [s['metrics']['jitter']['p95'] for s in scenarios]
-
-    ax5.bar(x - width, mean_jitter, width, label='Mean', color='#3498db', alpha=0.8)
-    ax5.bar(x, median_jitter, width, label='Median', color='#9b59b6', alpha=0.8)
-    ax5.bar(x + width, p95_jitter, width, label='95th %ile', color='#e67e22', alpha=0.8)
-
-    ax5.set_ylabel('Jitter (ms)', fontweight='bold')
-    ax5.set_title('Timing Jitter Distribution', fontweight='bold', fontsize=12)
-    ax5.set_xticks(x)
-    ax5.set_xticklabels(scenario_names, rotation=45, ha='right')
-    ax5.legend()
-    ax5.grid(axis='y', alpha=0.3)
-
-    # 6. Position Error Distribution
-    ax6 = plt.subplot(3, 3, 6)
-    mean_error = [s['metrics']['position_error']['mean'] for s in scenarios]
-    median_error = [s['metrics']['position_error']['median'] for s in scenarios]
-    p95_error = [s['metrics']['position_error']['p95'] for s in scenarios]
-
-    ax6.bar(x - width, mean_error, width, label='Mean', color='#3498db', alpha=0.8)
-    ax6.bar(x, median_error, width, label='Median', color='#9b59b6', alpha=0.8)
-    ax6.bar(x + width, p95_error, width, label='95th %ile', color='#e67e22', alpha=0.8)
-
-    ax6.set_ylabel('Position Error (units)', fontweight='bold')
-    ax6.set_title('Synchronization Error', fontweight='bold', fontsize=12)
-    ax6.set_xticks(x)
-    ax6.set_xticklabels(scenario_names, rotation=45, ha='right')
-    ax6.legend()
-    ax6.grid(axis='y', alpha=0.3)
+    offsets = (x - width, x, x + width)
+    series = (('Mean', '#3498db'), ('Median', '#9b59b6'), ('95th %ile', '#e67e22'))
+    distributions = (
+        (4, ('lat_mean', 'lat_med', 'lat_p95'), 'Latency (ms)', 'Latency Distribution'),
+        (5, ('jit_mean', 'jit_med', 'jit_p95'), 'Jitter (ms)', 'Timing Jitter Distribution'),
+        (6, ('err_mean', 'err_med', 'err_p95'), 'Position Error (units)', 'Synchronization Error'),
+    )
+    ax4 = None
+    for pos, fields, ylabel, title in distributions:
+        # Same scenarios on all three: the x ticks set on ax4 are shared by ax5/ax6
+        ax = fig.add_subplot(3, 3, pos, sharex=ax4)
+        if ax4 is None:
+            ax4 = ax
+            ax4.set_xticks(x)
+            ax4.set_xticklabels(scenario_names)
+
+        for offset, field, (label, color) in zip(offsets, fields, series):
+            ax.bar(offset, arr[field], width, label=label, color=color, alpha=0.8)
+
+        ax.set_ylabel(ylabel, fontweight='bold')
+        ax.set_title(title, fontweight='bold', fontsize=12)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
 
     # 7. Performance Degradation (normalized to baseline)
-    ax7 = plt.subplot(3, 3, 7)
-    baseline_updates = scenarios[0]['metrics']['updates_per_sec'] if scenarios else 1
-    normalized_updates = [(s['metrics']['updates_per_sec'] / baseline_updates * 100)
-                          for s in scenarios]
+    ax7 = fig.add_subplot(3, 3, 7)
+    normalized_updates = updates / updates[0] * 100
 
-    bars = ax7.bar(scenario_names, normalized_updates, color=colors, alpha=0.7, edgecolor='black')
+    bars = ax7.bar(scenario_names, normalized_updates, color=colors, **_BAR_KW)
     ax7.axhline(y=100, color='green', linestyle='--', linewidth=2, label='Baseline')
     ax7.set_ylabel('Performance (%)', fontweight='bold')
     ax7.set_title('Relative Performance (Update Rate)', fontweight='bold', fontsize=12)
     ax7.legend()
     ax7.grid(axis='y', alpha=0.3)
     ax7.tick_params(axis='x', rotation=45)
-    for bar, val in zip(bars, normalized_updates):
-        ax7.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 2,
-                 f'{val:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=8)
+    ax7.bar_label(bars, labels=[f'{val:.1f}%' for val in normalized_updates], **_SMALL_LABEL_KW)
 
     # 8. Resource Efficiency (Updates per CPU%)
-    ax8 = plt.subplot(3, 3, 8)
-    efficiency = []
-    for s in scenarios:
-        cpu_val = s['metrics']['cpu_percent']
-        if cpu_val > 0:
-            efficiency.append(s['metrics']['updates_per_sec'] / cpu_val)
-        else:
-            efficiency.append(0)
-    bars = ax8.bar(scenario_names, efficiency, color=colors, alpha=0.7, edgecolor='black')
+    ax8 = fig.add_subplot(3, 3, 8)
+    efficiency = np.divide(updates, cpu, out=np.zeros_like(updates), where=cpu > 0)
+    bars = ax8.bar(scenario_names, efficiency, color=colors, **_BAR_KW)
     ax8.set_ylabel('Updates/Sec per CPU%', fontweight='bold')
     ax8.set_title('CPU Efficiency', fontweight='bold', fontsize=12)
     ax8.grid(axis='y', alpha=0.3)
     ax8.tick_params(axis='x', rotation=45)
-    for bar, val in zip(bars, efficiency):
-        ax8.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
-                 f'{val:.2f}', ha='center', va='bottom', fontweight='bold', fontsize=8)
+    ax8.bar_label(bars, labels=[f'{val:.2f}' for val in efficiency], **_SMALL_LABEL_KW)
 
     # 9. Latency vs Position Error scatter
-    ax9 = plt.subplot(3, 3, 9)
-    latencies = [s['metrics']['latency']['mean'] for s in scenarios]
-    errors = [s['metrics']['position_error']['mean'] for s in scenarios]
-
-    for i, (lat, err, name, color) in enumerate(zip(latencies, errors, scenario_names, colors)):
-        ax9.scatter(lat, err, s=300, color=color, alpha=0.6, edgecolor='black', linewidth=2)
+    ax9 = fig.add_subplot(3, 3, 9)
+    latencies = arr['lat_mean']
+    errors = arr['err_mean']
+
+    # One scatter call (a single PathCollection) for all points; colors cycle like the bar colors
+    point_colors = [colors[i % len(colors)] for i in range(len(scenarios))]
+    ax9.scatter(latencies, errors, s=300, c=point_colors, alpha=0.6, edgecolor='black', linewidth=2)
+    for name, lat, err in zip(scenario_names, latencies, errors):
         ax9.annotate(name, (lat, err), xytext=(10, 10), textcoords='offset points',
                      fontweight='bold', fontsize=9)
 
@@ -304,26 +371,45 @@ def create_comparison_plots(scenarios, output_dir):
     ax9.set_title('Latency vs Synchronization Error', fontweight='bold', fontsize=12)
     ax9.grid(True, alpha=0.3)
 
-    plt.tight_layout()
+    fig.tight_layout()
     
-    output_file = output_dir / "all_scenarios_comparison.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    # Bars, lines and text only, so vector output: no 300 dpi rasterization or PNG encode
+    output_file = output_dir / "all_scenarios_comparison.svg"
+    fig.savefig(output_file, bbox_inches='tight')
     print(f"[+] Saved: {output_file}")
-    plt.close()
+    plt.close(fig)
 
 
-def create_individual_scenario_plots(scenarios, output_dir):
-    """Create detailed plots for each scenario (from plotter2.py)"""
+def create_individual_scenario_plots(scenarios, output_dir, max_workers=None):
+    """
+    Create detailed plots for each scenario (from plotter2.py).
+    The scenarios are split across worker processes (at most one per CPU); each PNG is independent.
+    """
     if not scenarios or len(scenarios) == 0:
         print("[WARN] No scenario data available for individual plots")
         return
-    
-    colors = ['#2ecc71', '#3498db', '#f39c12', '#e74c3c', '#9b59b6']
 
-    for idx, scenario in enumerate(scenarios):
-        color = colors[idx % len(colors)]
+    jobs = list(enumerate(scenarios))
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        _render_scenario_plots(jobs, output_dir)
+        return
+
+    # Every worker gets an interleaved share and renders it on its own reused figure
+    with ProcessPoolExecutor(max_workers=workers, initializer=matplotlib.use, initargs=('Agg',)) as ex:
+        list(ex.map(_render_scenario_plots, [jobs[i::workers] for i in range(workers)], repeat(output_dir)))
+
+
+def _render_scenario_plots(jobs, output_dir):
+    """Render (idx, scenario) jobs one after another on a single 2x2 figure."""
+    # One figure for all of these scenarios; the axes are cleared and redrawn for each
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+
+    for idx, scenario in jobs:
+        color = _COLORS[idx % len(_COLORS)]
         
-        fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+        for ax in axes.flat:
+            ax.cla()
         fig.suptitle(f'Detailed Analysis: {scenario["scenario"]}',
                      fontsize=16, fontweight='bold')
 
@@ -332,38 +418,31 @@ def create_individual_scenario_plots(scenarios, output_dir):
         latency_data = scenario['metrics']['latency']
         metrics = ['Mean', 'Median', '95th %ile']
         values = [latency_data['mean'], latency_data['median'], latency_data['p95']]
-        bars = ax1.bar(metrics, values, color=[color] * 3, alpha=0.7, edgecolor='black')
+        bars = ax1.bar(metrics, values, color=[color] * 3, **_BAR_KW)
         ax1.set_ylabel('Latency (ms)', fontweight='bold')
         ax1.set_title('Latency Metrics', fontweight='bold')
         ax1.grid(axis='y', alpha=0.3)
-        for bar, val in zip(bars, values):
-            ax1.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max(values) * 0.02,
-                     f'{val:.2f}', ha='center', va='bottom', fontweight='bold')
+        ax1.bar_label(bars, labels=[f'{val:.2f}' for val in values], **_LABEL_KW)
 
         # Jitter metrics
         ax2 = axes[0, 1]
         jitter_data = scenario['metrics']['jitter']
         values = [jitter_data['mean'], jitter_data['median'], jitter_data['p95']]
-        bars = ax2.bar(metrics, values, color=[color] * 3, alpha=0.7, edgecolor='black')
+        bars = ax2.bar(metrics, values, color=[color] * 3, **_BAR_KW)
         ax2.set_ylabel('Jitter (ms)', fontweight='bold')
         ax2.set_title('Timing Jitter Metrics', fontweight='bold')
         ax2.grid(axis='y', alpha=0.3)
-        for bar, val in zip(bars, values):
-            ax2.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max(values) * 0.02,
-                     f'{val:.2f}', ha='center', va='bottom', fontweight='bold')
+        ax2.bar_label(bars, labels=[f'{val:.2f}' for val in values], **_LABEL_KW)
 
         # Position error metrics
         ax3 = axes[1, 0]
         error_data = scenario['metrics']['position_error']
         values = [error_data['mean'], error_data['median'], error_data['p95']]
-        bars = ax3.bar(metrics, values, color=[color] * 3, alpha=0.7, edgecolor='black')
+        bars = ax3.bar(metrics, values, color=[color] * 3, **_BAR_KW)
         ax3.set_ylabel('Position Error (units)', fontweight='bold')
         ax3.set_title('Synchronization Error Metrics', fontweight='bold')
         ax3.grid(axis='y', alpha=0.3)
-        for bar, val in zip(bars, values):
-            ax3.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max(values) * 0.05,
-                     f'{val:.4f}' if val < 1 else f'{val:.2f}',
-                     ha='center', va='bottom', fontweight='bold')
+        ax3.bar_label(bars, labels=[f'{val:.4f}' if val < 1 else f'{val:.2f}' for val in values], **_LABEL_KW)
 
         # Summary metrics
         ax4 = axes[1, 1]
@@ -373,24 +452,29 @@ def create_individual_scenario_plots(scenarios, output_dir):
             scenario['metrics']['bandwidth_kbps'],
             scenario['metrics']['cpu_percent']
         ]
-        bars = ax4.bar(summary_metrics, summary_values, color=[color] * 3, alpha=0.7, edgecolor='black')
+        bars = ax4.bar(summary_metrics, summary_values, color=[color] * 3, **_BAR_KW)
         ax4.set_title('System Resource Metrics', fontweight='bold')
         ax4.grid(axis='y', alpha=0.3)
-        for bar, val in zip(bars, summary_values):
-            ax4.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max(summary_values) * 0.02,
-                     f'{val:.2f}', ha='center', va='bottom', fontweight='bold')
+        ax4.bar_label(bars, labels=[f'{val:.2f}' for val in summary_values], **_LABEL_KW)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
         # Save the figure
         safe_name = scenario["scenario"].replace(" ", "_").replace("%", "pct").lower()
         filename = output_dir / f'scenario_{safe_name}_detailed.png'
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
-        print(f'[+] Saved: {filename}')
-        plt.close()
+        fig.savefig(filename, dpi=300, bbox_inches='tight', pil_kwargs=PNG_PIL_KWARGS)
+        print(f'[+] Saved: {filename}', flush=True)
+
+    plt.close(fig)
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cache", help="pickle cache of the consolidated summary (see generate_suite_report)")
+    args = parser.parse_args()
+
+    matplotlib.use('Agg')  # batch run: figures are only saved, never shown
+
     print("=" * 60)
     print("    AUTO PLOTTER - GridClash Test Suite Visualization")
     print("=" * 60)
@@ -399,7 +483,7 @@ def main():
     output_dir = create_output_dir()
     
     # Load data
-    scenarios = load_summary_data()
+    scenarios = load_summary_data(args.cache)
     csv_df = load_csv_data()
     
     # Generate all plots
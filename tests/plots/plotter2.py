@@ -1,4 +1,15 @@
+import argparse
 import json
+import matplotlib
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--show", action="store_true", help="open the figures in windows after saving them")
+args = parser.parse_args()
+
+# Without --show nothing is displayed, so pick Agg before pyplot is imported and skip GUI backend setup
+if not args.show:
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
@@ -201,8 +212,10 @@ def create_comparison_plots():
 
     # 8. Resource Efficiency (Updates per CPU%)
     ax8 = plt.subplot(3, 3, 8)
-    efficiency = [s['metrics']['updates_per_sec'] / s['metrics']['cpu_percent']
-                  for s in scenarios]
+    updates_arr = np.array([s['metrics']['updates_per_sec'] for s in scenarios], dtype=np.float64)
+    cpu_arr = np.array([s['metrics']['cpu_percent'] for s in scenarios], dtype=np.float64)
+    # One masked divide; 0 where no CPU was measured instead of a ZeroDivisionError
+    efficiency = np.divide(updates_arr, cpu_arr, out=np.zeros_like(updates_arr), where=cpu_arr > 0)
     bars = ax8.bar(scenario_names, efficiency, color=colors, alpha=0.7, edgecolor='black')
     ax8.set_ylabel('Updates/Sec per CPU%', fontweight='bold')
     ax8.set_title('CPU Efficiency', fontweight='bold', fontsize=12)
@@ -309,4 +322,5 @@ print("\nGenerating individual scenario plots...")
 create_individual_scenario_plots()
 
 print("\nAll plots generated successfully!")
-plt.show()
\ No newline at end of file
+if args.show:
+    plt.show()